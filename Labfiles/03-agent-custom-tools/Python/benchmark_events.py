@@ -0,0 +1,137 @@
+""" Benchmark next_visible_event lookups against large synthetic event catalogs
+
+Writes a catalog in the data/events.txt format and compares parsing it into
+Python tuples at startup (the original loader) with compiling it once into the
+binary catalog and memory-mapping that. Lookups for random (location, day)
+pairs are timed four ways: the original linear scan, the catalog's bisect
+lookup, a full answer from the catalog, and the memoized JSON answers of
+next_visible_event.
+
+Run from the Python folder:
+
+    python benchmark_events.py --events 1000000 --lookups 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import functions
+
+from event_catalog import EventCatalog, compile_catalog
+
+LOCATIONS = ["north_america", "south_america", "europe", "asia", "africa", "australia", "antarctica"]
+TYPES = ["meteor_shower", "eclipse", "conjunction", "comet", "occultation"]
+
+
+def write_catalog(path: str, events: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(events):
+            month, day = rng.randint(1, 12), rng.randint(1, 28)
+            locs = ";".join(rng.sample(LOCATIONS, rng.randint(1, 3)))
+            f.write(f"Event {i}|{rng.choice(TYPES)}|{month:02d}-{day:02d}|{locs}\n")
+
+
+def load_tuples(file_path: str) -> list:
+    # The original loader: one tuple and one set per event, parsed at import time
+    events = []
+    with open(file_path) as f:
+        for line in f:
+            parts = line.strip().split("|")
+            if len(parts) == 4:
+                month, day = map(int, parts[2].split("-"))
+                events.append((parts[0], parts[1], month * 100 + day, parts[2], set(parts[3].split(";"))))
+    events.sort(key=lambda e: e[2])
+    return events
+
+
+def linear_next_event(events: list, loc: str, today: int) -> str | None:
+    # The original lookup: scan every event and sort the locations of the hit
+    for name, event_type, date, date_str, locs in events:
+        if loc in locs and date >= today:
+            return json.dumps({"event": name, "type": event_type, "date": date_str, "visible_from": sorted(locs)})
+    return None
+
+
+def measure(fn):
+    # Result, seconds and Python heap growth of one call
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    heap_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return result, round(seconds, 3), round(heap_mb, 1)
+
+
+def time_lookups(lookup, queries: list) -> dict:
+    latencies = []
+    for loc, today in queries:
+        start = time.perf_counter()
+        lookup(loc, today)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "lookups": len(latencies),
+        "mean_us": round(sum(latencies) / len(latencies) * 1e6, 2),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 2),
+        "p99_us": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="next_visible_event lookup cost on large catalogs")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--linear-lookups", type=int, default=200, help="the linear scan is slow, so it gets fewer")
+    parser.add_argument("--days", type=int, default=30, help="distinct days the queries fall on")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    days = [rng.randint(1, 12) * 100 + rng.randint(1, 31) for _ in range(args.days)]
+    queries = [(rng.choice(LOCATIONS), rng.choice(days)) for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path, catalog_path = os.path.join(tmp, "events.txt"), os.path.join(tmp, "events.bin")
+        write_catalog(text_path, args.events)
+
+        # tracemalloc slows allocation-heavy parsing down, so startup times are taken without it
+        start = time.perf_counter()
+        events = load_tuples(text_path)
+        tuples_s = time.perf_counter() - start
+        del events
+        _, _, tuples_mb = measure(lambda: load_tuples(text_path))
+        events = load_tuples(text_path)
+
+        start = time.perf_counter()
+        compile_catalog(text_path, catalog_path)
+        compile_s = round(time.perf_counter() - start, 3)
+        catalog, open_s, catalog_mb = measure(lambda: EventCatalog.open(catalog_path))
+
+        # Point the tool at the synthetic catalog
+        functions._events.cache_clear()
+        functions._next_event_json.cache_clear()
+        functions._events = lambda: catalog
+
+        results = {
+            "events": len(catalog),
+            "text_load": {"seconds": round(tuples_s, 3), "heap_mb": tuples_mb},
+            "catalog_compile_s": compile_s,
+            "catalog_open": {"seconds": open_s, "heap_mb": catalog_mb, "file_mb": round(os.path.getsize(catalog_path) / 1e6, 1)},
+            "linear": time_lookups(lambda loc, today: linear_next_event(events, loc, today), queries[:args.linear_lookups]),
+            "bisect": time_lookups(catalog.next_event, queries),
+            "answer": time_lookups(lambda loc, today: catalog.event(catalog.next_event(loc, today)), queries),
+            "memoized": time_lookups(functions._next_event_json, queries),
+            "memo_cache": functions._next_event_json.cache_info()._asdict(),
+        }
+        catalog.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+""" Compiled, memory-mapped event catalog for the next_visible_event tool
+
+The converter reads the pipe-delimited text catalog (name|type|MM-DD|loc;loc)
+and writes a binary file of columns, one value per event, in date order:
+
+- dates:        month * 100 + day (uint16)
+- types:        interned event type id (uint16)
+- masks:        bitset of interned location ids (uint64 words)
+- name offsets: where each name starts in the UTF-8 name blob (uint64)
+
+plus, for each location, the rows visible from it and their dates, so the
+next event is a binary search away. Location ids follow the sorted location
+names, so the bits of a mask already list its locations in sorted order.
+
+The file starts with a magic string and a JSON header that holds the interned
+tables and the section offsets. Sections are 8-byte aligned and stored in the
+native byte order, so opening a catalog is an mmap plus zero-copy memoryview
+casts; nothing is parsed per event.
+
+Convert a catalog ahead of time with:
+
+    python event_catalog.py data/events.txt data/events.bin
+"""
+
+import json
+import mmap
+import os
+import sys
+
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"EVTCAT\x00\x01"
+VERSION = 1
+
+# Section name -> array typecode
+SECTIONS = {
+    "dates": "H",
+    "types": "H",
+    "masks": "Q",
+    "name_offsets": "Q",
+    "names": "B",
+    "location_offsets": "Q",
+    "location_rows": "I",
+    "location_dates": "H",
+}
+
+
+def _read_text(text_path: str) -> tuple[list, list, list, list]:
+    # Parse the text catalog into plain columns; malformed lines are skipped as before
+    names, types, dates, locations = [], [], [], []
+    with open(text_path) as f:
+        for line in f:
+            parts = line.strip().split("|")
+            if len(parts) == 4:
+                month, day = map(int, parts[2].split("-"))
+                names.append(parts[0])
+                types.append(parts[1])
+                dates.append(month * 100 + day)
+                locations.append(parts[3])
+    return names, types, dates, locations
+
+
+def build_catalog(text_path: str) -> bytes:
+    """Convert a text catalog into the binary catalog format."""
+
+    names, types, dates, locations = _read_text(text_path)
+
+    # Intern type and location strings; location ids are bit positions in the masks
+    type_table = sorted(set(types))
+    location_table = sorted({loc for locs in set(locations) for loc in locs.split(";")})
+    type_ids = {name: i for i, name in enumerate(type_table)}
+    location_ids = {name: i for i, name in enumerate(location_table)}
+    mask_words = max(1, (len(location_table) + 63) // 64)
+
+    # Rows are stored in date order (stable, like the original sort)
+    order = sorted(range(len(dates)), key=dates.__getitem__)
+
+    # Rows share a handful of location lists, so each list's mask words and bits are worked out once
+    location_sets = {}
+    for locs in set(locations):
+        bits = sorted({location_ids[loc] for loc in locs.split(";")})
+        mask = sum(1 << bit for bit in bits)
+        words = [(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for word in range(mask_words)]
+        location_sets[locs] = (words, bits)
+
+    columns = {code: array(typecode) for code, typecode in SECTIONS.items()}
+    columns["dates"] = array("H", [dates[i] for i in order])
+    columns["types"] = array("H", [type_ids[types[i]] for i in order])
+
+    postings = [[] for _ in location_table]
+    masks = columns["masks"]
+    for row, i in enumerate(order):
+        words, bits = location_sets[locations[i]]
+        masks.extend(words)
+        for bit in bits:
+            postings[bit].append(row)
+
+    encoded = [names[i].encode() for i in order]
+    offsets = [0]
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    columns["name_offsets"] = array("Q", offsets)
+    columns["names"] = array("B", b"".join(encoded))
+
+    columns["location_offsets"].append(0)
+    for rows in postings:
+        columns["location_rows"].extend(rows)
+        columns["location_dates"].extend([columns["dates"][row] for row in rows])
+        columns["location_offsets"].append(len(columns["location_rows"]))
+
+    # Lay the sections out after the header, each on an 8-byte boundary
+    sections, body = {}, bytearray()
+    for code, column in columns.items():
+        body += bytes(-len(body) % 8)
+        sections[code] = [len(body), len(column)]
+        body += column.tobytes()
+
+    header = json.dumps({
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "events": len(order),
+        "mask_words": mask_words,
+        "types": type_table,
+        "locations": location_table,
+        "sections": sections,
+    }).encode()
+    start = len(MAGIC) + 4 + len(header)
+    start += -start % 8
+    prefix = MAGIC + len(header).to_bytes(4, "little") + header
+    return prefix + bytes(start - len(prefix)) + body
+
+
+def compile_catalog(text_path: str, catalog_path: str) -> None:
+    """Write the binary catalog for ``text_path`` to ``catalog_path``, replacing it atomically."""
+
+    data = build_catalog(text_path)
+    tmp_path = f"{catalog_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, catalog_path)
+
+
+def _header(buffer) -> tuple[dict, int] | None:
+    # The parsed header and where the sections start, or None if this is not a current catalog
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        return None
+    length = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 4], "little")
+    header = json.loads(bytes(buffer[len(MAGIC) + 4:len(MAGIC) + 4 + length]))
+    if header.get("version") != VERSION or header.get("byteorder") != sys.byteorder:
+        return None
+    start = len(MAGIC) + 4 + length
+    return header, start + -start % 8
+
+
+class EventCatalog:
+    """Read-only view of a binary catalog held in an mmap or in memory."""
+
+    def __init__(self, buffer, mapping: mmap.mmap | None = None):
+        parsed = _header(buffer)
+        if parsed is None:
+            raise ValueError("Not a current event catalog; rebuild it with compile_catalog")
+        header, start = parsed
+
+        self._mapping = mapping
+        self._view = memoryview(buffer)
+        self.events = header["events"]
+        self.mask_words = header["mask_words"]
+        self.types = header["types"]
+        self.locations = header["locations"]
+        self.location_ids = {name: i for i, name in enumerate(self.locations)}
+
+        # Zero-copy typed views over each section
+        self._columns = {}
+        for code, (offset, count) in header["sections"].items():
+            size = array(SECTIONS[code]).itemsize
+            self._columns[code] = self._view[start + offset:start + offset + count * size].cast(SECTIONS[code])
+
+    @classmethod
+    def open(cls, path: str) -> 'EventCatalog':
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapping, mapping)
+        except Exception:
+            mapping.close()
+            raise
+
+    @staticmethod
+    def is_current(path: str) -> bool:
+        with open(path, "rb") as f:
+            head = f.read(len(MAGIC) + 4)
+            if len(head) < len(MAGIC) + 4:
+                return False
+            head += f.read(int.from_bytes(head[len(MAGIC):], "little"))
+        try:
+            return _header(head) is not None
+        except ValueError:
+            return False
+
+    def __len__(self) -> int:
+        return self.events
+
+    def next_event(self, location: str, today: int) -> int | None:
+        """Row of the first event visible from ``location`` on or after ``today`` (MMDD), wrapping to next year."""
+
+        loc = self.location_ids.get(location)
+        if loc is None:
+            return None
+        offsets = self._columns["location_offsets"]
+        first, last = offsets[loc], offsets[loc + 1]
+        if first == last:
+            return None
+        position = bisect_left(self._columns["location_dates"], today, first, last)
+        return self._columns["location_rows"][first + (position - first) % (last - first)]
+
+    def event(self, row: int) -> tuple[str, str, str, list[str]]:
+        """Name, type, MM-DD date and sorted visible locations of the event in ``row``."""
+
+        offsets = self._columns["name_offsets"]
+        name = bytes(self._columns["names"][offsets[row]:offsets[row + 1]]).decode()
+        date = self._columns["dates"][row]
+        return name, self.types[self._columns["types"][row]], f"{date // 100:02d}-{date % 100:02d}", self.visible_from(row)
+
+    def visible_from(self, row: int) -> list[str]:
+        masks = self._columns["masks"]
+        locations = []
+        for word in range(self.mask_words):
+            mask = masks[row * self.mask_words + word]
+            while mask:
+                low = mask & -mask
+                locations.append(self.locations[64 * word + low.bit_length() - 1])
+                mask ^= low
+        return locations
+
+    def close(self) -> None:
+        # Views must be released before the mapping can be closed
+        for column in self._columns.values():
+            column.release()
+        self._view.release()
+        if self._mapping is not None:
+            self._mapping.close()
+
+
+def load_catalog(text_path: str, catalog_path: str) -> EventCatalog:
+    """Open the compiled catalog, first rebuilding it if the text catalog is newer or the format changed."""
+
+    stale = (
+        not os.path.exists(catalog_path)
+        or os.path.getmtime(catalog_path) < os.path.getmtime(text_path)
+        or not EventCatalog.is_current(catalog_path)
+    )
+    if stale:
+        try:
+            compile_catalog(text_path, catalog_path)
+        except OSError as e:
+            # E.g. a read-only folder: keep the compiled catalog in memory instead
+            print(f"WARNING: Could not write {catalog_path} ({e}); using an in-memory catalog")
+            return EventCatalog(build_catalog(text_path))
+    return EventCatalog.open(catalog_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python event_catalog.py <events.txt> <events.bin>")
+    compile_catalog(sys.argv[1], sys.argv[2])
+    catalog = EventCatalog.open(sys.argv[2])
+    print(f"Compiled {len(catalog)} events for {len(catalog.locations)} locations into {sys.argv[2]}")
+    catalog.close()
@@ -1,23 +1,7 @@
 import json
 from datetime import datetime
-
-def _load_events(file_path: str = "data/events.txt") -> list:
-    events = []
-    with open(file_path) as f:
-        for line in f:
-            parts = line.strip().split("|")
-            if len(parts) == 4:
-                month, day = map(int, parts[2].split("-"))
-                events.append((
-                    parts[0],                          # name
-                    parts[1],                          # type
-                    month * 100 + day,                 # sortable month-day int
-                    parts[2],                          # month-day string
-                    set(parts[3].split(";")),          # locations as a set
-                ))
-    events.sort(key=lambda e: e[2])
-    return events
-
+from functools import lru_cache
+from event_catalog import EventCatalog, load_catalog
 
 def _load_rates(file_path: str) -> dict:
     rates = {}
@@ -28,10 +12,25 @@ def _load_rates(file_path: str) -> dict:
                 rates[parts[0]] = float(parts[1])
     return rates
 
-EVENTS = _load_events()
+
 TELESCOPE_RATES = _load_rates("data/telescope_rates.txt")
 PRIORITY_MULTIPLIERS = _load_rates("data/priority_multipliers.txt")
 
+# The event catalog is compiled from data/events.txt and memory-mapped on first use, not at import
+@lru_cache(maxsize=None)
+def _events() -> EventCatalog:
+    return load_catalog("data/events.txt", "data/events.bin")
+
+# The answer only changes with the location and the day, so repeated calls reuse the JSON
+@lru_cache(maxsize=4096)
+def _next_event_json(loc: str, today: int) -> str | None:
+    catalog = _events()
+    row = catalog.next_event(loc, today)
+    if row is None:
+        return None
+    name, event_type, date_str, visible_from = catalog.event(row)
+    return json.dumps({"event": name, "type": event_type, "date": date_str, "visible_from": visible_from})
+
 # Determine the next visible astronomical event for a given location
 def next_visible_event(location: str) -> str:
     """Returns the next visible astronomical event for a location."""
@@ -39,9 +38,9 @@ def next_visible_event(location: str) -> str:
     loc = location.lower().replace(" ", "_")
 
     # Retrieve the next event visible from the location, starting with events later this year
-    for name, event_type, date, date_str, locs in EVENTS:
-        if loc in locs and date >= today:
-            return json.dumps({"event": name, "type": event_type, "date": date_str, "visible_from": sorted(locs)})
+    result = _next_event_json(loc, today)
+    if result is not None:
+        return result
 
     return json.dumps({"message": f"No upcoming events found for {location}."})
 
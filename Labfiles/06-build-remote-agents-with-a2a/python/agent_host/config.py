@@ -0,0 +1,65 @@
+""" Declarative specialist agent configuration """
+
+import json
+import os
+
+from dataclasses import dataclass, field
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agents.json")
+
+
+@dataclass
+class AgentSpec:
+    """Everything needed to host one specialist agent: its Foundry agent and its A2A card."""
+
+    key: str
+    label: str
+    name: str
+    description: str
+    foundry_name: str
+    instructions: str
+    port_env: str
+    streaming: bool = False
+    skills: list[AgentSkill] = field(default_factory=list)
+
+    @property
+    def port(self) -> int:
+        return int(os.environ[self.port_env])
+
+    def card(self, host: str) -> AgentCard:
+        return AgentCard(
+            name=self.name,
+            description=self.description,
+            url=f'http://{host}:{self.port}/',
+            version='1.0.0',
+            default_input_modes=['text'],
+            default_output_modes=['text'],
+            capabilities=AgentCapabilities(streaming=self.streaming),
+            skills=self.skills,
+        )
+
+
+def load_agent_specs(path: str | None = None, keys: list[str] | None = None) -> list[AgentSpec]:
+    """Load agent specs from ``path`` (default ``AGENT_HOST_CONFIG`` or ``agents.json``).
+
+    When ``keys`` is given, only those agents are returned, in that order.
+    """
+
+    path = path or os.getenv("AGENT_HOST_CONFIG", DEFAULT_CONFIG_PATH)
+    with open(path) as f:
+        entries = json.load(f)
+
+    specs = {}
+    for entry in entries:
+        skills = [AgentSkill(**skill) for skill in entry.pop("skills", [])]
+        specs[entry["key"]] = AgentSpec(**entry, skills=skills)
+
+    if keys is None:
+        return list(specs.values())
+
+    missing = [key for key in keys if key not in specs]
+    if missing:
+        raise ValueError(f"Unknown agent(s) {', '.join(missing)} in {path}. Choose from: {', '.join(specs)}")
+    return [specs[key] for key in keys]
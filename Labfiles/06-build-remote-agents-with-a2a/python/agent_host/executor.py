@@ -0,0 +1,135 @@
+""" A2A executor that runs any hosted Foundry specialist agent """
+
+import os
+import time
+import tracing
+import uuid
+
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.agent_execution.context import RequestContext
+from a2a.server.events.event_queue import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import AgentCard, Part, TaskState, TextPart
+from a2a.utils import new_agent_text_message
+from agent_host.foundry_agent import FoundryAgent
+from agent_host.limiter import AgentBusyError
+
+class FoundryAgentExecutor(AgentExecutor):
+
+    def __init__(self, card: AgentCard, agent: FoundryAgent):
+        self._card = card
+        self._foundry_agent = agent
+        self._label = agent.spec.label
+
+        # Streaming agents send model output as artifact chunks, at most once per interval
+        self._streaming = agent.spec.streaming
+        self._flush_interval = float(os.getenv('AGENT_STREAM_FLUSH_INTERVAL', '0.05'))
+
+    async def _process_request(self, message_parts: list[Part], context_id: str, task_updater: TaskUpdater) -> None:
+        # Process a user request through the Foundry agent
+
+        try:
+            # Retrieve message from A2A parts
+            user_message = message_parts[0].root.text
+
+            # Update the task status
+            await task_updater.update_status(
+                TaskState.working,
+                message=new_agent_text_message(f'{self._label} is processing your request...', context_id=context_id),
+            )
+
+            if self._streaming:
+                # Stream the response as it is generated
+                response = await self._stream_response(user_message, context_id, task_updater)
+                responses = [response] if response else ['No response received']
+            else:
+                # Run the agent conversation
+                responses = await self._foundry_agent.run_conversation(user_message, context_id=context_id)
+
+                # Update the task with the responses
+                for response in responses:
+                    await task_updater.update_status(
+                        TaskState.working,
+                        message=new_agent_text_message(response, context_id=context_id),
+                    )
+
+            # Mark the task as complete
+            tracing.annotate(state='completed')
+            final_message = responses[-1] if responses else 'Task completed.'
+            await task_updater.complete(
+                message=new_agent_text_message(final_message, context_id=context_id)
+            )
+
+        except AgentBusyError as e:
+            print(f'{self._label}: Rejecting request - {e}')
+            tracing.annotate(state='rejected')
+            await task_updater.reject(
+                message=new_agent_text_message(f'{self._label} is busy. Please try again shortly.', context_id=context_id)
+            )
+
+        except Exception as e:
+            print(f'{self._label}: Error processing request - {e}')
+            tracing.annotate(state='failed', error=str(e))
+            await task_updater.failed(
+                message=new_agent_text_message(f'{self._label} failed to process the request.', context_id=context_id)
+            )
+
+    async def _stream_response(self, user_message: str, context_id: str, task_updater: TaskUpdater) -> str:
+        # Forward model output as chunks of one artifact and return the full text
+
+        artifact_id = str(uuid.uuid4())
+        chunks: list[str] = []
+        pending: list[str] = []
+        sent_chunks = 0
+        last_flush = time.monotonic()
+
+        async def flush(last_chunk: bool) -> None:
+            # Chunks go to the SSE stream only; the task store saves the whole artifact once the task completes
+            nonlocal sent_chunks, last_flush
+            await task_updater.add_artifact(
+                [Part(root=TextPart(text=''.join(pending)))],
+                artifact_id=artifact_id,
+                name='response',
+                append=sent_chunks > 0,
+                last_chunk=last_chunk,
+            )
+            pending.clear()
+            sent_chunks += 1
+            last_flush = time.monotonic()
+
+        async for text in self._foundry_agent.run_conversation_stream(user_message, context_id=context_id):
+            chunks.append(text)
+            pending.append(text)
+            if time.monotonic() - last_flush >= self._flush_interval:
+                await flush(last_chunk=False)
+
+        if pending or sent_chunks:
+            await flush(last_chunk=True)
+        return ''.join(chunks)
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue):
+
+        # Continue the caller's trace when the A2A message carries one
+        parent = tracing.extract(context.message.metadata)
+        with tracing.span('agent.execute', parent=parent, agent=self._label, task_id=context.task_id, context_id=context.context_id):
+
+            # Create task updater
+            updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+            await updater.submit()
+
+            # Start working
+            await updater.start_work()
+
+            # Process the request
+            await self._process_request(context.message.parts, context.context_id, updater)
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        print(f'{self._label}: Cancelling execution for context {context.context_id}')
+
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.failed(
+            message=new_agent_text_message('Task cancelled by user', context_id=context.context_id)
+        )
+
+def create_foundry_agent_executor(card: AgentCard, agent: FoundryAgent) -> FoundryAgentExecutor:
+    return FoundryAgentExecutor(card, agent)
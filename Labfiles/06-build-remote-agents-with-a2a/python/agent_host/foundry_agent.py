@@ -0,0 +1,164 @@
+""" Azure AI Foundry specialist agent driven by an AgentSpec """
+
+import asyncio
+import os
+import tracing
+import uuid
+
+from collections.abc import AsyncIterator
+
+from azure.ai.agents.aio import AgentsClient
+from azure.ai.agents.models import Agent, AgentStreamEvent, ListSortOrder, MessageRole
+from agent_host.config import AgentSpec
+from agent_host.limiter import RunLimiter
+from agent_host.thread_pool import ContextThreadPool
+
+# Terminal run events other than completion
+_RUN_NOT_COMPLETED = (
+    AgentStreamEvent.THREAD_RUN_FAILED,
+    AgentStreamEvent.THREAD_RUN_CANCELLED,
+    AgentStreamEvent.THREAD_RUN_EXPIRED,
+    AgentStreamEvent.THREAD_RUN_INCOMPLETE,
+)
+
+class FoundryAgent:
+
+    def __init__(self, spec: AgentSpec, client: AgentsClient):
+
+        # The async agents client is shared by every agent in the host
+        self.spec = spec
+        self.client = client
+
+        self.agent: Agent | None = None
+        self._create_lock = asyncio.Lock()
+
+        # Bound concurrent runs and reject requests once the wait queue is full
+        max_concurrent = int(os.getenv('AGENT_MAX_CONCURRENT_RUNS', '8'))
+        self.limiter = RunLimiter(
+            max_concurrent=max_concurrent,
+            max_queued=int(os.getenv('AGENT_MAX_QUEUED_RUNS', '32')),
+        )
+
+        # Threads are reused per A2A context; spares (one per concurrent run by default) keep creation off the request path
+        self.threads = ContextThreadPool(
+            create_thread=self.client.threads.create,
+            delete_thread=self.client.threads.delete,
+            spare_threads=int(os.getenv('AGENT_SPARE_THREADS', str(max_concurrent))),
+            ttl_seconds=float(os.getenv('AGENT_THREAD_TTL', '900')),
+        )
+        self.poll_interval = float(os.getenv('AGENT_RUN_POLL_INTERVAL', '0.5'))
+
+    async def create_agent(self) -> Agent:
+        # Concurrent first requests must not create the Foundry agent twice
+        async with self._create_lock:
+            if self.agent:
+                return self.agent
+
+            # Create the Foundry agent described by the spec
+            self.agent = await self.client.create_agent(
+                model=os.environ['MODEL_DEPLOYMENT_NAME'],
+                name=self.spec.foundry_name,
+                instructions=self.spec.instructions,
+            )
+
+            # Have spare threads ready before the first request arrives
+            self.threads.warm()
+
+            return self.agent
+
+    async def run_conversation(self, user_message: str, context_id: str | None = None) -> list[str]:
+        # Add a message to the thread, process it, and retrieve the response
+
+        if not self.agent:
+            await self.create_agent()
+
+        # Reuse the thread for this A2A context instead of creating one per request
+        context_id = context_id or str(uuid.uuid4())
+        async with self.limiter.slot(), self.threads.thread(context_id) as thread_id:
+
+            # Send user message
+            with tracing.span('foundry.create_message'):
+                await self.client.messages.create(thread_id=thread_id, role=MessageRole.USER, content=user_message)
+
+            # Create and run the agent
+            with tracing.span('foundry.run', agent=self.spec.label, streamed=False):
+                run = await self.client.runs.create_and_process(
+                    thread_id=thread_id, agent_id=self.agent.id, polling_interval=self.poll_interval
+                )
+                tracing.annotate(status=str(run.status))
+
+            if run.status == 'failed':
+                print(f'{self.spec.label}: Run failed - {run.last_error}')
+                self.threads.reset(context_id)
+                return [f'Error: {run.last_error}']
+
+            # Get response messages
+            responses = []
+            with tracing.span('foundry.list_messages'):
+                messages = self.client.messages.list(thread_id=thread_id, order=ListSortOrder.DESCENDING)
+                async for msg in messages:
+                    # Only get the latest assistant response
+                    if msg.role == MessageRole.AGENT and msg.text_messages:
+                        for text_msg in msg.text_messages:
+                            responses.append(text_msg.text.value)
+                        break
+
+            return responses if responses else ['No response received']
+
+    async def run_conversation_stream(self, user_message: str, context_id: str | None = None) -> AsyncIterator[str]:
+        # Add a message to the thread and yield the response text as the model produces it
+
+        if not self.agent:
+            await self.create_agent()
+
+        context_id = context_id or str(uuid.uuid4())
+        async with self.limiter.slot(), self.threads.thread(context_id) as thread_id:
+
+            # Send user message
+            with tracing.span('foundry.create_message'):
+                await self.client.messages.create(thread_id=thread_id, role=MessageRole.USER, content=user_message)
+
+            # The run span is not made current: the caller runs between the chunks yielded here
+            span = tracing.start_span('foundry.run', agent=self.spec.label, streamed=True)
+            error = None
+            chunks = 0
+            try:
+                # Stream the run instead of polling it to completion
+                async with await self.client.runs.stream(thread_id=thread_id, agent_id=self.agent.id) as stream:
+                    async for event_type, event_data, _ in stream:
+                        if event_type == AgentStreamEvent.THREAD_MESSAGE_DELTA:
+                            text = getattr(event_data, 'text', '')
+                            if text:
+                                chunks += 1
+                                yield text
+                        elif event_type in _RUN_NOT_COMPLETED:
+                            # Anything but a completed run fails the task rather than returning partial text
+                            reason = event_data.last_error or event_data.incomplete_details or event_data.status
+                            print(f'{self.spec.label}: Run {event_data.status} - {reason}')
+                            self.threads.reset(context_id)
+                            raise RuntimeError(f'Run {event_data.status}: {reason}')
+                        elif event_type == AgentStreamEvent.ERROR:
+                            print(f'{self.spec.label}: Stream error - {event_data}')
+                            self.threads.reset(context_id)
+                            raise RuntimeError(f'Run stream error: {event_data}')
+            except GeneratorExit:
+                # The consumer stopped reading early, which is not a failed run
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                if span is not None:
+                    span.attributes['chunks'] = chunks
+                tracing.end_span(span, error)
+
+    async def close(self) -> None:
+        await self.threads.close()
+
+        # Every worker process and restart creates its own Foundry agent, so remove it with the worker
+        if self.agent:
+            try:
+                await self.client.delete_agent(self.agent.id)
+            except Exception as e:
+                print(f'WARNING: Failed to delete agent {self.agent.id}: {e}')
+            self.agent = None
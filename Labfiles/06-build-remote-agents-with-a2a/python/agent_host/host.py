@@ -0,0 +1,114 @@
+""" Hosts any number of specialist agents from declarative specs """
+
+import asyncio
+import os
+
+from contextlib import asynccontextmanager
+
+import uvicorn
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import AgentCard
+from azure.ai.agents.aio import AgentsClient
+from azure.identity.aio import DefaultAzureCredential
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from agent_host.config import AgentSpec
+from agent_host.executor import create_foundry_agent_executor
+from agent_host.foundry_agent import FoundryAgent
+from agent_host.task_store import SQLiteTaskStore, create_task_store
+
+
+class AgentHost:
+    """Builds the A2A app for each spec on top of shared resources.
+
+    Every hosted agent uses the same credential (and therefore token cache)
+    and the same async ``AgentsClient`` (and therefore HTTP connection pool).
+    ``serve`` runs all of them on their own ports in one event loop.
+    """
+
+    def __init__(self, specs: list[AgentSpec], host: str, client: AgentsClient | None = None):
+        self.specs = {spec.key: spec for spec in specs}
+        self.host = host
+
+        # One credential and one client for every agent in the process
+        self.credential = None
+        if client is None:
+            self.credential = DefaultAzureCredential(
+                exclude_environment_credential=True,
+                exclude_managed_identity_credential=True,
+            )
+            client = AgentsClient(endpoint=os.environ['PROJECT_ENDPOINT'], credential=self.credential)
+        self.client = client
+
+        self.agents = {key: FoundryAgent(spec, self.client) for key, spec in self.specs.items()}
+
+        # Task ids are unique, so every hosted agent can share one task store
+        self.task_store = create_task_store()
+
+    def card(self, key: str) -> AgentCard:
+        return self.specs[key].card(self.host)
+
+    def build_app(self, key: str, owns_host: bool = False) -> Starlette:
+        """Build the A2A app for one agent.
+
+        With ``owns_host`` the app closes the whole host on shutdown, which is
+        what a process serving a single agent wants.
+        """
+
+        spec = self.specs[key]
+        agent_card = self.card(key)
+
+        # Create request handler
+        request_handler = DefaultRequestHandler(
+            agent_executor=create_foundry_agent_executor(agent_card, self.agents[key]),
+            task_store=self.task_store,
+        )
+
+        # Get routes
+        routes = A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).routes()
+
+        # Add health check endpoint
+        async def health_check(request: Request) -> PlainTextResponse:
+            return PlainTextResponse(f'{spec.name} is running!')
+
+        routes.append(Route(path='/health', methods=['GET'], endpoint=health_check))
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette):
+            yield
+            if owns_host:
+                await self.close()
+
+        return Starlette(routes=routes, lifespan=lifespan)
+
+    async def serve(self, log_level: str = 'info') -> None:
+        """Serve every hosted agent on its own port until one server stops."""
+
+        servers = [
+            uvicorn.Server(uvicorn.Config(self.build_app(key), host=self.host, port=spec.port, log_level=log_level))
+            for key, spec in self.specs.items()
+        ]
+        tasks = [asyncio.create_task(server.serve()) for server in servers]
+        for spec in self.specs.values():
+            print(f'Hosting {spec.label} on port {spec.port}')
+
+        try:
+            # A signal only reaches one server, so stop the rest with it
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for server in servers:
+                server.should_exit = True
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(agent.close() for agent in self.agents.values()))
+        if isinstance(self.task_store, SQLiteTaskStore):
+            self.task_store.close()
+        if self.credential is not None:
+            await self.client.close()
+            await self.credential.close()
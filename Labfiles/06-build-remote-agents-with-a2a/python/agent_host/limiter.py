@@ -0,0 +1,50 @@
+""" Bounded concurrency with backpressure for Foundry agent runs """
+
+import asyncio
+
+from contextlib import asynccontextmanager
+
+
+class AgentBusyError(Exception):
+    """Raised when a run cannot be queued because the agent is saturated."""
+
+
+class RunLimiter:
+    """Allows ``max_concurrent`` runs at once and ``max_queued`` more to wait.
+
+    Requests beyond that are rejected right away with ``AgentBusyError``
+    instead of piling up behind runs that may take many seconds each.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queued: int = 32):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+        self._running = 0
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._slots.locked() and self._waiting >= self.max_queued:
+            raise AgentBusyError(f"Agent is busy ({self._running} running, {self._waiting} queued)")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._slots.release()
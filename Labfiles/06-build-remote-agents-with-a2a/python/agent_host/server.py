@@ -0,0 +1,26 @@
+""" Runs every configured specialist agent in one process
+
+    python -m agent_host.server                  # all agents in agents.json
+    python -m agent_host.server title outline    # only the named agents
+"""
+
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+from agent_host.config import load_agent_specs
+from agent_host.host import AgentHost
+
+load_dotenv()
+
+def main():
+    keys = sys.argv[1:] or None
+    host = AgentHost(load_agent_specs(keys=keys), os.environ["SERVER_URL"])
+    try:
+        asyncio.run(host.serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
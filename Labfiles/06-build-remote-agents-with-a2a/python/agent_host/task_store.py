@@ -0,0 +1,136 @@
+""" Persistent, bounded A2A task store backed by SQLite """
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import Task, TaskState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    context_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_context_id ON tasks (context_id);
+CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at);
+"""
+
+
+class SQLiteTaskStore(TaskStore):
+    """Stores tasks in a SQLite file so they survive restarts.
+
+    Lookups by ``task_id`` and ``context_id`` are indexed. Tasks not updated
+    for ``ttl_seconds`` are treated as gone and deleted, and the oldest tasks
+    beyond ``max_tasks`` are pruned, so neither memory nor the file grows
+    without bound. Pruning runs on the save path at most every
+    ``prune_interval`` seconds or after ``max_tasks // 10`` saves.
+
+    A working task that already has artifacts is being streamed: each chunk
+    would rewrite the whole growing task, so those saves are skipped and the
+    task is written again when its state changes (e.g. to completed). The
+    request handler keeps the current task in memory meanwhile.
+    """
+
+    def __init__(self, path: str, max_tasks: int = 10000, ttl_seconds: float = 86400.0,
+                 prune_interval: float = 60.0):
+        self.path = path
+        self.max_tasks = max_tasks
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval = prune_interval
+        self._prune_every = max(1, max_tasks // 10)
+        self._saves_since_prune = 0
+        self._last_prune = time.monotonic()
+
+        # One connection used from worker threads, one statement at a time
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._prune()
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        if task.status.state == TaskState.working and task.artifacts:
+            return
+        await asyncio.to_thread(self._save, task.id, task.context_id, task.model_dump_json(by_alias=True))
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        data = await asyncio.to_thread(self._get, task_id)
+        return Task.model_validate_json(data) if data else None
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    async def list_by_context(self, context_id: str) -> list[Task]:
+        """Return the live tasks of one context, oldest first."""
+
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT data FROM tasks WHERE context_id = ? AND updated_at >= ? ORDER BY updated_at",
+            (context_id, time.time() - self.ttl_seconds),
+        )
+        return [Task.model_validate_json(data) for (data,) in rows]
+
+    def _save(self, task_id: str, context_id: str, data: str) -> None:
+        self._execute(
+            "INSERT INTO tasks (task_id, context_id, updated_at, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (task_id) DO UPDATE SET context_id = excluded.context_id, "
+            "updated_at = excluded.updated_at, data = excluded.data",
+            (task_id, context_id, time.time(), data),
+        )
+        self._saves_since_prune += 1
+        if (self._saves_since_prune >= self._prune_every
+                or time.monotonic() - self._last_prune >= self.prune_interval):
+            self._prune()
+
+    def _get(self, task_id: str) -> str | None:
+        rows = self._query(
+            "SELECT data FROM tasks WHERE task_id = ? AND updated_at >= ?",
+            (task_id, time.time() - self.ttl_seconds),
+        )
+        return rows[0][0] if rows else None
+
+    def _prune(self) -> None:
+        # Drop expired tasks, then everything older than the newest max_tasks
+        self._execute("DELETE FROM tasks WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+        self._execute(
+            "DELETE FROM tasks WHERE updated_at < ("
+            "SELECT updated_at FROM tasks ORDER BY updated_at DESC LIMIT 1 OFFSET ?)",
+            (self.max_tasks - 1,),
+        )
+        self._saves_since_prune = 0
+        self._last_prune = time.monotonic()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM tasks", ())[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_task_store() -> TaskStore:
+    """Build the task store selected by ``AGENT_TASK_STORE`` ("sqlite" or "memory")."""
+
+    if os.getenv("AGENT_TASK_STORE", "sqlite") == "memory":
+        return InMemoryTaskStore()
+
+    return SQLiteTaskStore(
+        path=os.getenv("AGENT_TASK_STORE_PATH", ".agent_tasks.db"),
+        max_tasks=int(os.getenv("AGENT_TASK_MAX", "10000")),
+        ttl_seconds=float(os.getenv("AGENT_TASK_TTL", "86400")),
+    )
@@ -0,0 +1,179 @@
+""" Foundry threads reused per A2A context instead of created per request """
+
+import asyncio
+import time
+import tracing
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ContextThread:
+    """The Foundry thread bound to one A2A context."""
+
+    context_id: str
+    thread_id: str
+    last_used: float = field(default_factory=time.monotonic)
+    # Requests holding or waiting for the context; its thread is never deleted while any do
+    users: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ContextThreadPool:
+    """Binds A2A ``context_id``s to Foundry threads.
+
+    Requests in the same context reuse its thread, one at a time; the routing
+    agent sends its session id as the context id, so a user's follow-up turns
+    land on the same thread. ``spare_threads`` threads are created ahead of time,
+    and refilled concurrently, so new contexts do not pay for thread creation
+    on the request path. Contexts idle for longer than ``ttl_seconds``
+    are released by a background cleanup loop and their threads deleted, and
+    ``reset`` drops a context's thread so its next request starts clean.
+    """
+
+    def __init__(self, create_thread: Callable[[], Awaitable[Any]], delete_thread: Callable[[str], Awaitable[Any]],
+                 spare_threads: int = 2, max_contexts: int = 256, ttl_seconds: float = 900.0,
+                 cleanup_interval: float = 60.0):
+        self._create_thread = create_thread
+        self._delete_thread = delete_thread
+        self.spare_threads = spare_threads
+        self.max_contexts = max_contexts
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval = cleanup_interval
+        self._contexts: OrderedDict[str, ContextThread] = OrderedDict()
+        self._spares: list[str] = []
+        self._spares_pending = 0
+        self._cleanup_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def warm(self) -> None:
+        """Start creating spare threads and the cleanup loop in the background."""
+        self._start_cleanup()
+        self._refill()
+
+    @asynccontextmanager
+    async def thread(self, context_id: str):
+        """Yield the thread id for ``context_id`` while holding the context."""
+
+        self._start_cleanup()
+        while True:
+            with tracing.span("foundry.thread", context_id=context_id):
+                entry = await self._get_or_bind(context_id)
+            try:
+                async with entry.lock:
+                    # A reset while this request waited retires the thread; bind the context again
+                    if self._contexts.get(context_id) is not entry:
+                        continue
+                    try:
+                        yield entry.thread_id
+                    finally:
+                        entry.last_used = time.monotonic()
+                    return
+            finally:
+                self._release(entry)
+
+    def reset(self, context_id: str) -> None:
+        """Forget the context's thread; its next request gets a fresh one."""
+
+        entry = self._contexts.pop(context_id, None)
+        if entry and not entry.users:
+            self._spawn(self._delete(entry.thread_id))
+
+    def _release(self, entry: ContextThread) -> None:
+        # The last user of a retired context deletes its thread
+        entry.users -= 1
+        if not entry.users and self._contexts.get(entry.context_id) is not entry:
+            self._spawn(self._delete(entry.thread_id))
+
+    async def _get_or_bind(self, context_id: str) -> ContextThread:
+        # Returns the entry with a reference taken for the caller, released by _release
+        entry = self._contexts.get(context_id)
+        if entry:
+            self._contexts.move_to_end(context_id)
+            entry.users += 1
+            tracing.annotate(source="context")
+            return entry
+
+        # Prefer a pre-created spare; only create inline when none is ready
+        tracing.annotate(source="spare" if self._spares else "created")
+        thread_id = self._spares.pop() if self._spares else (await self._create_thread()).id
+        self._refill()
+
+        # Another request may have bound the context while we were creating
+        entry = self._contexts.get(context_id)
+        if entry:
+            self._spares.append(thread_id)
+            entry.users += 1
+            return entry
+
+        entry = ContextThread(context_id=context_id, thread_id=thread_id, users=1)
+        self._contexts[context_id] = entry
+        self._evict_over_capacity()
+        return entry
+
+    def _refill(self) -> None:
+        # Create every missing spare at once, so a burst is replenished in one round trip
+        missing = self.spare_threads - len(self._spares) - self._spares_pending
+        for _ in range(max(0, missing)):
+            self._spares_pending += 1
+            self._spawn(self._create_spare())
+
+    async def _create_spare(self) -> None:
+        try:
+            thread = await self._create_thread()
+        except Exception as e:
+            print(f"WARNING: Failed to pre-create thread: {e}")
+            return
+        finally:
+            self._spares_pending -= 1
+        self._spares.append(thread.id)
+
+    def _evict_over_capacity(self) -> None:
+        for entry in list(self._contexts.values()):
+            if len(self._contexts) <= self.max_contexts:
+                break
+            if not entry.users:
+                self.reset(entry.context_id)
+
+    def _start_cleanup(self) -> None:
+        if self._cleanup_task is None and self.cleanup_interval > 0:
+            self._cleanup_task = asyncio.get_running_loop().create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            now = time.monotonic()
+            for entry in list(self._contexts.values()):
+                if now - entry.last_used > self.ttl_seconds and not entry.users:
+                    self.reset(entry.context_id)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _delete(self, thread_id: str) -> None:
+        try:
+            await self._delete_thread(thread_id)
+        except Exception as e:
+            print(f"WARNING: Failed to delete thread {thread_id}: {e}")
+
+    async def close(self) -> None:
+        """Stop background work and delete every thread the pool holds."""
+
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+
+        # Let spares being created land first, so their threads are deleted too
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        thread_ids = [entry.thread_id for entry in self._contexts.values()] + self._spares
+        self._contexts.clear()
+        self._spares.clear()
+        await asyncio.gather(*(self._delete(thread_id) for thread_id in thread_ids), *self._background_tasks)
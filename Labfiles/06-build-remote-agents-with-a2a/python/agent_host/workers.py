@@ -0,0 +1,297 @@
+""" Pre-fork multi-worker serving for the A2A agent servers
+
+    python -m agent_host.workers title_agent.server:app --port 10007 --workers 4
+
+The supervisor binds the port once and starts N worker processes that all
+accept on that socket, so the kernel spreads connections across cores. Each
+worker can be pinned to one CPU. Dead workers are restarted with exponential
+backoff, and a slot whose worker keeps dying right after it starts (e.g. on
+an import error) is given up after ``max_restarts`` attempts. SIGHUP replaces
+workers one at a time without dropping the port, and every worker exposes
+the shared per-worker metrics at /workers.
+
+Each worker keeps its own Foundry client, thread pool and run limiter, and
+creates its own Foundry agent, which it deletes when it shuts down (a worker
+that is killed outright cannot). Because the thread pool is per worker, a
+context's conversation thread lives in whichever worker served it first.
+The kernel spreads connections without regard to the A2A contextId, so a
+session's follow-up turns only continue its conversation with sticky routing
+in front of the workers, e.g. a load balancer that hashes the contextId to
+one worker port. Without it, turns that land on another worker start a new
+thread.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from uvicorn.importer import import_from_string
+
+# Slot layout in the shared metrics array
+PID, STARTED, REQUESTS, ERRORS, IN_FLIGHT, LATENCY_MS, RESTARTS, CPU = range(8)
+FIELDS = 8
+
+multiprocessing.allow_connection_pickling()
+_spawn = multiprocessing.get_context("spawn")
+
+
+class WorkerMetricsMiddleware:
+    """Counts requests for one worker slot and serves every slot at ``/workers``."""
+
+    def __init__(self, app, metrics, slot: int, slot_count: int):
+        self.app = app
+        self.metrics = metrics
+        self.base = slot * FIELDS
+        self.slot_count = slot_count
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if scope["path"] == "/workers":
+            return await self._send_metrics(send)
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        self._add(IN_FLIGHT, 1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._add(IN_FLIGHT, -1)
+            self._add(REQUESTS, 1)
+            self._add(LATENCY_MS, (time.perf_counter() - start) * 1000)
+            if status >= 500:
+                self._add(ERRORS, 1)
+
+    def _add(self, field: int, value: float) -> None:
+        # Only this worker writes its slot, so no lock is needed
+        self.metrics[self.base + field] += value
+
+    async def _send_metrics(self, send) -> None:
+        body = json.dumps({"serving_pid": os.getpid(), "workers": worker_metrics(self.metrics, self.slot_count)}).encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def worker_metrics(metrics, slot_count: int) -> list[dict]:
+    """Snapshot the live worker slots of the shared metrics array."""
+
+    workers = []
+    for slot in range(slot_count):
+        values = metrics[slot * FIELDS:(slot + 1) * FIELDS]
+        if not values[PID]:
+            continue
+        requests = int(values[REQUESTS])
+        workers.append({
+            "slot": slot,
+            "pid": int(values[PID]),
+            "cpu": int(values[CPU]) if values[CPU] >= 0 else None,
+            "uptime_s": round(time.time() - values[STARTED], 1),
+            "requests": requests,
+            "errors": int(values[ERRORS]),
+            "in_flight": int(values[IN_FLIGHT]),
+            "avg_latency_ms": round(values[LATENCY_MS] / requests, 1) if requests else 0.0,
+            "restarts": int(values[RESTARTS]),
+        })
+    return workers
+
+
+def _run_worker(app_path: str, sock: socket.socket, metrics, slot: int, slot_count: int,
+                cpu: int | None, log_level: str) -> None:
+    # Pin the worker before it loads the app so every thread inherits the mask
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+    app = WorkerMetricsMiddleware(import_from_string(app_path), metrics, slot, slot_count)
+
+    base = slot * FIELDS
+    for field in (REQUESTS, ERRORS, IN_FLIGHT, LATENCY_MS):
+        metrics[base + field] = 0
+    metrics[base + STARTED] = time.time()
+    metrics[base + CPU] = cpu if cpu is not None else -1
+    metrics[base + PID] = os.getpid()
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+    try:
+        server.run(sockets=[sock])
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerSupervisor:
+    """Keeps ``workers`` processes serving ``app_path`` on one shared socket.
+
+    Metrics use two slots per worker so a replacement can start while the
+    worker it replaces drains during a reload. A worker that dies within
+    ``stable_after`` seconds of starting counts as a failed start: the next
+    restart of its slot waits ``restart_backoff`` seconds, doubling up to
+    ``max_backoff``, and after ``max_restarts`` failed starts in a row the slot
+    is left empty. Every restart creates a new Foundry agent, so a crash loop
+    must not run unchecked.
+    """
+
+    def __init__(self, app_path: str, host: str, port: int, workers: int = 2, pin_cpus: bool = False,
+                 log_level: str = "info", shutdown_timeout: float = 30.0, restart_backoff: float = 0.5,
+                 max_backoff: float = 30.0, max_restarts: int = 5, stable_after: float = 30.0):
+        self.app_path = app_path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.pin_cpus = pin_cpus and hasattr(os, "sched_setaffinity")
+        self.log_level = log_level
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.max_restarts = max_restarts
+        self.stable_after = stable_after
+        self.slot_count = workers * 2
+        self.metrics = _spawn.Array("d", self.slot_count * FIELDS, lock=False)
+        self._processes: dict[int, multiprocessing.Process] = {}
+        # Per slot: when its worker started, failed starts in a row, and when it may restart
+        self._started: dict[int, float] = {}
+        self._failures: dict[int, int] = {}
+        self._restart_at: dict[int, float] = {}
+        self._should_exit = False
+        self._should_reload = False
+
+    def _cpu(self, index: int) -> int | None:
+        if not self.pin_cpus:
+            return None
+        cpus = sorted(os.sched_getaffinity(0))
+        return cpus[index % len(cpus)]
+
+    def _start(self, slot: int) -> multiprocessing.Process:
+        index = slot % self.workers
+        process = _spawn.Process(
+            target=_run_worker,
+            args=(self.app_path, self.sock, self.metrics, slot, self.slot_count, self._cpu(index), self.log_level),
+            name=f"worker-{index}",
+        )
+        process.start()
+        self._processes[slot] = process
+        self._started[slot] = time.monotonic()
+        return process
+
+    def _stop(self, slot: int) -> None:
+        process = self._processes.pop(slot)
+        self._restart_at.pop(slot, None)
+        if process.is_alive():
+            # uvicorn finishes in-flight requests on SIGTERM
+            process.terminate()
+        process.join(self.shutdown_timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        self.metrics[slot * FIELDS + PID] = 0
+
+    def _wait_ready(self, slot: int, process: multiprocessing.Process, timeout: float = 30.0) -> bool:
+        # A worker fills in its pid once the app is imported, just before it serves
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and process.is_alive():
+            if self.metrics[slot * FIELDS + PID] == process.pid:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def _reload(self) -> None:
+        # Replace workers one at a time so the port never stops accepting
+        print(f"Reloading {self.workers} workers for {self.app_path}")
+        for slot in sorted(self._processes):
+            replacement = (slot + self.workers) % self.slot_count
+            if replacement in self._processes:
+                continue
+            process = self._start(replacement)
+            if not self._wait_ready(replacement, process):
+                print(f"WARNING: Replacement worker {process.pid} failed to start; keeping the old worker")
+                self._stop(replacement)
+                continue
+            self._stop(slot)
+
+    def _restart_dead(self) -> None:
+        now = time.monotonic()
+        for slot, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+
+            # Work out the backoff once, when the worker is first seen dead
+            if slot not in self._restart_at:
+                uptime = now - self._started.get(slot, now)
+                failures = self._failures.get(slot, 0) + 1 if uptime < self.stable_after else 0
+                self._failures[slot] = failures
+                if failures > self.max_restarts:
+                    print(f"ERROR: Worker {process.pid} failed to start {failures} times in a row; giving up on slot {slot}")
+                    del self._processes[slot]
+                    self.metrics[slot * FIELDS + PID] = 0
+                    continue
+                delay = min(self.restart_backoff * 2 ** (failures - 1), self.max_backoff) if failures else 0.0
+                self._restart_at[slot] = now + delay
+                print(f"Worker {process.pid} exited with code {process.exitcode}; restarting in {delay:.1f}s")
+
+            if now >= self._restart_at[slot]:
+                del self._restart_at[slot]
+                self.metrics[slot * FIELDS + RESTARTS] += 1
+                self._start(slot)
+
+    def _handle_exit(self, sig, frame) -> None:
+        self._should_exit = True
+
+    def _handle_reload(self, sig, frame) -> None:
+        self._should_reload = True
+
+    def run(self) -> None:
+        self.sock = uvicorn.Config(self.app_path, host=self.host, port=self.port).bind_socket()
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._handle_reload)
+
+        print(f"Starting {self.workers} workers for {self.app_path} on {self.host}:{self.port}")
+        for slot in range(self.workers):
+            self._start(slot)
+
+        try:
+            while not self._should_exit:
+                if self._should_reload:
+                    self._should_reload = False
+                    self._reload()
+                self._restart_dead()
+                if not self._processes:
+                    print(f"ERROR: No workers left for {self.app_path}; stopping")
+                    break
+                time.sleep(0.5)
+        finally:
+            for slot in list(self._processes):
+                self._stop(slot)
+            self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an ASGI agent app with several worker processes")
+    parser.add_argument("app", help="import string, e.g. title_agent.server:app")
+    parser.add_argument("--host", default=os.getenv("SERVER_URL", "127.0.0.1"))
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("AGENT_WORKERS", str(os.cpu_count() or 1))))
+    parser.add_argument("--pin-cpus", action="store_true", default=os.getenv("AGENT_WORKER_PIN_CPUS") == "1",
+                        help="pin each worker to one CPU (Linux only)")
+    parser.add_argument("--max-restarts", type=int, default=int(os.getenv("AGENT_WORKER_MAX_RESTARTS", "5")),
+                        help="failed starts in a row before a worker slot is given up")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    WorkerSupervisor(args.app, args.host, args.port, workers=args.workers, pin_cpus=args.pin_cpus,
+                     log_level=args.log_level, max_restarts=args.max_restarts).run()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+""" Load test showing that concurrent A2A tasks overlap on one specialist agent server
+
+Hosts the title agent's A2A app in-process on top of the fake agents service and
+sends N tasks at once. With non-blocking Foundry calls the wall time stays close
+to a single run; --blocking replays the old synchronous client for comparison.
+--stream sends the tasks over SSE and also reports the time to the first chunk
+of streamed output.
+
+Run from the python folder:
+
+    python -m benchmarks.executor_load_test --tasks 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import time
+import uuid
+
+import httpx
+import uvicorn
+
+from a2a.client import A2AClient
+from a2a.types import MessageSendParams, SendMessageRequest, SendStreamingMessageRequest, TaskArtifactUpdateEvent
+from agent_host.config import load_agent_specs
+from agent_host.host import AgentHost
+from benchmarks.fake_agents import FakeAgentsClient
+from benchmarks.stats import summarize
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _make_blocking(fake: FakeAgentsClient) -> None:
+    # Emulate the synchronous AgentsClient: the whole run holds the event loop
+    async def create_and_process(thread_id: str, agent_id: str, **kwargs):
+        run = fake._new_run(thread_id)
+        time.sleep(run.remaining() + fake.generation_time())
+        fake._finish(run)
+        return run.snapshot()
+    fake.runs.create_and_process = create_and_process
+
+
+async def run_load_test(args) -> dict:
+    fake = FakeAgentsClient(api_latency=args.api_latency, run_latency=args.run_latency, tool_calls_per_run=0,
+                            reply=" ".join(["word"] * args.reply_words), token_delay=args.token_delay)
+    specs = load_agent_specs(keys=["title"])
+    if args.blocking:
+        # The synchronous client only ran whole conversations
+        _make_blocking(fake)
+        specs[0].streaming = False
+
+    port = _free_port()
+    os.environ["TITLE_AGENT_PORT"] = str(port)
+    agent_host = AgentHost(specs, "127.0.0.1", client=fake)
+    await agent_host.agents["title"].create_agent()
+    agent_card = agent_host.card("title")
+    app = agent_host.build_app("title")
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    latencies: list[float] = []
+    first_chunks: list[float] = []
+    async with httpx.AsyncClient(timeout=120) as http_client:
+        client = A2AClient(http_client, agent_card, url=f"http://127.0.0.1:{port}/")
+
+        async def one_task(i: int) -> None:
+            message_id = str(uuid.uuid4())
+            payload = {"message": {"role": "user", "parts": [{"kind": "text", "text": f"topic {i}"}], "messageId": message_id}}
+            start = time.perf_counter()
+            if args.stream:
+                request = SendStreamingMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
+                first_chunk = None
+                async for response in client.send_message_streaming(request):
+                    if first_chunk is None and isinstance(response.root.result, TaskArtifactUpdateEvent):
+                        first_chunk = time.perf_counter() - start
+                if first_chunk is not None:
+                    first_chunks.append(first_chunk)
+            else:
+                await client.send_message(SendMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload)))
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_task(i) for i in range(args.tasks)))
+        wall_time = time.perf_counter() - start
+
+    server.should_exit = True
+    await server_task
+    await agent_host.close()
+
+    result = {"mode": "blocking" if args.blocking else "async", "stream": args.stream, "tasks": args.tasks, **summarize(latencies, wall_time)}
+    if first_chunks:
+        result["first_chunk"] = {key: value for key, value in summarize(first_chunks, wall_time).items() if key.endswith("_ms")}
+    # 1 means tasks ran one at a time; async mode overlaps up to AGENT_MAX_CONCURRENT_RUNS
+    result["peak_concurrent_runs"] = fake.peak_active_runs
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent A2A task load test for the title agent")
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--run-latency", type=float, default=0.5, help="seconds per model run")
+    parser.add_argument("--api-latency", type=float, default=0.01, help="seconds per service call")
+    parser.add_argument("--blocking", action="store_true", help="emulate the synchronous Foundry client")
+    parser.add_argument("--stream", action="store_true", help="send tasks over SSE and time the first output chunk")
+    parser.add_argument("--reply-words", type=int, default=40, help="words in each model reply")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed words")
+    args = parser.parse_args()
+
+    # The specialist agent only reads this to name a model, so no Azure config is needed
+    os.environ.setdefault("MODEL_DEPLOYMENT_NAME", "benchmark-model")
+
+    # Keep the lab's own task database out of the load test
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AGENT_TASK_STORE_PATH"] = os.path.join(tmp, "agent_tasks.db")
+        results = asyncio.run(run_load_test(args))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
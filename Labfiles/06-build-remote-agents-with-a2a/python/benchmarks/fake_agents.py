@@ -0,0 +1,350 @@
+""" In-process stand-in for the async Azure AI Agents client, used by the benchmarks """
+
+import asyncio
+import itertools
+import json
+import time
+
+from types import SimpleNamespace
+
+from benchmarks.stats import StageTimer
+
+
+class FakeRun:
+    """A run that moves queued -> in_progress -> (requires_action -> in_progress)* -> completed over time.
+
+    Each batch in ``tool_call_batches`` is one requires_action phase, i.e. one model turn.
+    """
+
+    def __init__(self, run_id: str, thread_id: str, run_latency: float, tool_call_batches: list[list]):
+        self.id = run_id
+        self.thread_id = thread_id
+        self.run_latency = run_latency
+        self.pending_batches = [batch for batch in tool_call_batches if batch]
+        self.created = time.perf_counter()
+        self.phase_started = self.created
+        self.finished = False
+        self.last_error = None
+
+    @property
+    def status(self) -> str:
+        elapsed = time.perf_counter() - self.phase_started
+        if elapsed < self.run_latency:
+            return "in_progress"
+        if self.pending_batches:
+            return "requires_action"
+        return "completed"
+
+    @property
+    def required_action(self):
+        tool_calls = self.pending_batches[0] if self.pending_batches else []
+        return SimpleNamespace(submit_tool_outputs=SimpleNamespace(tool_calls=tool_calls))
+
+    def submit(self) -> None:
+        self.pending_batches.pop(0)
+        self.phase_started = time.perf_counter()
+
+    def remaining(self) -> float:
+        return max(0.0, self.run_latency - (time.perf_counter() - self.phase_started))
+
+    def snapshot(self):
+        return SimpleNamespace(
+            id=self.id,
+            thread_id=self.thread_id,
+            status=self.status,
+            required_action=self.required_action,
+            last_error=self.last_error,
+        )
+
+
+class FakeRunStream:
+    """Mimics AsyncAgentRunStream: an async context manager yielding an event iterator."""
+
+    def __init__(self, service: "FakeAgentsClient", run: FakeRun):
+        self._service = service
+        self._events = asyncio.Queue()
+        self._schedule(run)
+
+    def _schedule(self, run: FakeRun) -> None:
+        asyncio.get_running_loop().create_task(self._emit(run))
+
+    async def _emit(self, run: FakeRun) -> None:
+        await self._events.put(("thread.run.in_progress", run.snapshot(), None))
+        await asyncio.sleep(run.remaining())
+        snapshot = run.snapshot()
+        if snapshot.status == "completed":
+            for word in self._service.reply.split(" "):
+                await self._events.put(("thread.message.delta", SimpleNamespace(text=f"{word} "), None))
+                if self._service.token_delay:
+                    await asyncio.sleep(self._service.token_delay)
+            self._service._finish(run)
+        await self._events.put((f"thread.run.{snapshot.status}", snapshot, None))
+        if snapshot.status != "requires_action":
+            await self._events.put(("done", "[DONE]", None))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self._events.get()
+        if event[0] == "done":
+            raise StopAsyncIteration()
+        return event
+
+
+class FakeAgentsClient:
+    """Serves threads, messages and runs from memory with configurable latency.
+
+    ``api_latency`` is added to every call and ``run_latency`` is how long each run
+    phase takes. When ``tool_calls_per_run`` is set, each run asks for that many
+    ``send_message`` calls, each passing on the thread's latest user message:
+    all in one ``requires_action`` phase (``tool_call_mode="parallel"``) or one
+    per phase (``"sequential"``, as when each call needs the previous answer).
+    ``"pipeline"`` asks for a single ``run_pipeline`` call of ``pipeline`` instead.
+    Replies are generated one word per
+    ``token_delay``. With ``stages`` set, each run's duration is recorded as
+    ``<stage_prefix>.run``.
+    """
+
+    def __init__(self, api_latency: float = 0.01, run_latency: float = 0.3, tool_calls_per_run: int = 1,
+                 agent_names: list[str] | None = None, reply: str = "Fake agent reply", token_delay: float = 0.0,
+                 stages: StageTimer | None = None, stage_prefix: str = "agents", tool_call_mode: str = "parallel",
+                 pipeline: str = "blog_plan"):
+        self.api_latency = api_latency
+        self.run_latency = run_latency
+        self.tool_calls_per_run = tool_calls_per_run
+        self.tool_call_mode = tool_call_mode
+        self.pipeline = pipeline
+        self.agent_names = agent_names or ["Microsoft Foundry Title Agent", "AI Foundry Outline Agent"]
+        self.reply = reply
+        self.token_delay = token_delay
+        self.stages = stages
+        self.stage_prefix = stage_prefix
+        self.calls: dict[str, int] = {}
+        self.active_runs = 0
+        self.peak_active_runs = 0
+        self._ids = itertools.count(1)
+        self._runs: dict[str, FakeRun] = {}
+        self._messages: dict[str, list] = {}
+
+        self.threads = SimpleNamespace(create=self._create_thread, delete=self._delete_thread)
+        self.messages = SimpleNamespace(create=self._create_message, list=self._list_messages)
+        self.runs = SimpleNamespace(
+            create=self._create_run,
+            create_and_process=self._create_and_process,
+            get=self._get_run,
+            submit_tool_outputs=self._submit_tool_outputs,
+            stream=self._stream_run,
+            submit_tool_outputs_stream=self._submit_tool_outputs_stream,
+        )
+
+    async def _call(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        await asyncio.sleep(self.api_latency)
+
+    def _next_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids)}"
+
+    def _tool_call(self, name: str, arguments: dict):
+        return SimpleNamespace(id=self._next_id("call"), function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+    def _tool_call_batches(self, thread_id: str) -> list[list]:
+        # Delegate the latest user message so distinct requests make distinct tasks
+        task = next((message.content for message in reversed(self._messages.get(thread_id, [])) if message.role == "user"), "benchmark task")
+        if not self.tool_calls_per_run:
+            return []
+        if self.tool_call_mode == "pipeline":
+            return [[self._tool_call("run_pipeline", {"pipeline_name": self.pipeline, "task": task})]]
+        calls = [
+            self._tool_call("send_message", {"agent_name": self.agent_names[i % len(self.agent_names)], "task": task})
+            for i in range(self.tool_calls_per_run)
+        ]
+        return [[call] for call in calls] if self.tool_call_mode == "sequential" else [calls]
+
+    async def create_agent(self, **kwargs):
+        await self._call("create_agent")
+        return SimpleNamespace(id=self._next_id("asst"), name=kwargs.get("name"))
+
+    async def update_agent(self, agent_id: str, **kwargs):
+        await self._call("update_agent")
+        return SimpleNamespace(id=agent_id, name=kwargs.get("name"))
+
+    async def delete_agent(self, agent_id: str) -> None:
+        await self._call("delete_agent")
+
+    async def close(self) -> None:
+        return None
+
+    async def _create_thread(self, **kwargs):
+        await self._call("threads.create")
+        thread_id = self._next_id("thread")
+        self._messages[thread_id] = []
+        return SimpleNamespace(id=thread_id)
+
+    async def _delete_thread(self, thread_id: str):
+        await self._call("threads.delete")
+        self._messages.pop(thread_id, None)
+
+    async def _create_message(self, thread_id: str, role, content: str, **kwargs):
+        await self._call("messages.create")
+        message = SimpleNamespace(id=self._next_id("msg"), role="user", content=content, text_messages=[])
+        self._messages.setdefault(thread_id, []).append(message)
+        return message
+
+    def _list_messages(self, thread_id: str, **kwargs):
+        async def _iterate():
+            await self._call("messages.list")
+            for message in reversed(self._messages.get(thread_id, [])):
+                yield message
+        return _iterate()
+
+    def generation_time(self) -> float:
+        # Time to produce the whole reply at the configured token rate
+        return len(self.reply.split(" ")) * self.token_delay
+
+    def _finish(self, run: FakeRun) -> None:
+        # Append the assistant reply once, when the run first reports completion
+        if run.finished:
+            return
+        run.finished = True
+        self.active_runs -= 1
+        if self.stages is not None:
+            self.stages.record(f"{self.stage_prefix}.run", time.perf_counter() - run.created)
+        text = SimpleNamespace(text=SimpleNamespace(value=self.reply))
+        reply = SimpleNamespace(id=self._next_id("msg"), role="assistant", content=self.reply, text_messages=[text])
+        self._messages.setdefault(run.thread_id, []).append(reply)
+
+    def _new_run(self, thread_id: str) -> FakeRun:
+        run = FakeRun(self._next_id("run"), thread_id, self.run_latency, self._tool_call_batches(thread_id))
+        self._runs[run.id] = run
+        self.active_runs += 1
+        self.peak_active_runs = max(self.peak_active_runs, self.active_runs)
+        return run
+
+    async def _create_run(self, thread_id: str, agent_id: str, **kwargs):
+        await self._call("runs.create")
+        return self._new_run(thread_id).snapshot()
+
+    async def _create_and_process(self, thread_id: str, agent_id: str, **kwargs):
+        await self._call("runs.create_and_process")
+        run = self._new_run(thread_id)
+        await asyncio.sleep(run.remaining() + self.generation_time())
+        self._finish(run)
+        return run.snapshot()
+
+    async def _get_run(self, thread_id: str, run_id: str, **kwargs):
+        await self._call("runs.get")
+        run = self._runs[run_id]
+        snapshot = run.snapshot()
+        if snapshot.status == "completed":
+            self._finish(run)
+        return snapshot
+
+    async def _submit_tool_outputs(self, thread_id: str, run_id: str, tool_outputs: list, **kwargs):
+        await self._call("runs.submit_tool_outputs")
+        run = self._runs[run_id]
+        run.submit()
+        return run.snapshot()
+
+    async def _stream_run(self, thread_id: str, agent_id: str, **kwargs):
+        await self._call("runs.stream")
+        return FakeRunStream(self, self._new_run(thread_id))
+
+    async def _submit_tool_outputs_stream(self, thread_id: str, run_id: str, tool_outputs: list, event_handler: FakeRunStream, **kwargs):
+        await self._call("runs.submit_tool_outputs_stream")
+        run = self._runs[run_id]
+        run.submit()
+        event_handler._schedule(run)
+
+
+class FakeSyncAgentsClient:
+    """Blocking stand-in for azure.ai.agents.AgentsClient, as used by the scripted labs.
+
+    Every service call takes ``api_latency`` and is recorded as
+    ``<stage_prefix>.<call>`` in ``stages``. A run first takes ``run_latency``
+    to plan, then runs each of the agent's connected agents in turn, then
+    writes its reply; connected agents take ``run_latency`` plus their own
+    reply time and are recorded as ``<stage_prefix>.connected_run``.
+    """
+
+    def __init__(self, api_latency: float = 0.01, run_latency: float = 0.3, token_delay: float = 0.0,
+                 reply: str = "Fake agent reply", stages: StageTimer | None = None, stage_prefix: str = "agents", **kwargs):
+        self.api_latency = api_latency
+        self.run_latency = run_latency
+        self.token_delay = token_delay
+        self.reply = reply
+        self.stages = stages or StageTimer()
+        self.stage_prefix = stage_prefix
+        self._ids = itertools.count(1)
+        self._agents: dict[str, SimpleNamespace] = {}
+        self._messages: dict[str, list] = {}
+
+        self.threads = SimpleNamespace(create=self._create_thread)
+        self.messages = SimpleNamespace(create=self._create_message, list=self._list_messages)
+        self.runs = SimpleNamespace(create_and_process=self._create_and_process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        return None
+
+    def _next_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids)}"
+
+    def _call(self, name: str, seconds: float = 0.0) -> None:
+        with self.stages.time(f"{self.stage_prefix}.{name}"):
+            time.sleep(self.api_latency + seconds)
+
+    def generation_time(self) -> float:
+        return len(self.reply.split(" ")) * self.token_delay
+
+    def create_agent(self, model: str | None = None, name: str | None = None, instructions: str | None = None, tools: list | None = None, **kwargs):
+        self._call("create_agent")
+        agent = SimpleNamespace(id=self._next_id("asst"), name=name, tools=list(tools or []))
+        self._agents[agent.id] = agent
+        return agent
+
+    def delete_agent(self, agent_id: str) -> None:
+        self._call("delete_agent")
+        self._agents.pop(agent_id, None)
+
+    def _create_thread(self, **kwargs):
+        self._call("threads.create")
+        thread_id = self._next_id("thread")
+        self._messages[thread_id] = []
+        return SimpleNamespace(id=thread_id)
+
+    def _create_message(self, thread_id: str, role, content: str, **kwargs):
+        self._call("messages.create")
+        message = SimpleNamespace(id=self._next_id("msg"), role="user", content=content,
+                                  text_messages=[SimpleNamespace(text=SimpleNamespace(value=content))])
+        self._messages.setdefault(thread_id, []).append(message)
+        return message
+
+    def _list_messages(self, thread_id: str, order=None, **kwargs):
+        self._call("messages.list")
+        messages = list(self._messages.get(thread_id, []))
+        return messages if order in (None, "asc") else list(reversed(messages))
+
+    def _create_and_process(self, thread_id: str, agent_id: str, **kwargs):
+        agent = self._agents[agent_id]
+        with self.stages.time(f"{self.stage_prefix}.runs.create_and_process"):
+            time.sleep(self.api_latency + self.run_latency)
+            for _ in agent.tools:
+                with self.stages.time(f"{self.stage_prefix}.connected_run"):
+                    time.sleep(self.run_latency + self.generation_time())
+            time.sleep(self.generation_time())
+
+        text = SimpleNamespace(text=SimpleNamespace(value=self.reply))
+        self._messages[thread_id].append(SimpleNamespace(id=self._next_id("msg"), role="assistant", content=self.reply, text_messages=[text]))
+        return SimpleNamespace(id=self._next_id("run"), thread_id=thread_id, status="completed", last_error=None)
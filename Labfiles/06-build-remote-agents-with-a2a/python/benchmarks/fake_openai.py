@@ -0,0 +1,137 @@
+""" In-process stand-ins for AIProjectClient and its OpenAI conversations/responses client, used by the benchmarks """
+
+import itertools
+import json
+import threading
+import time
+
+from types import SimpleNamespace
+
+from benchmarks.stats import StageTimer
+
+
+class FakeCredential:
+    """Accepts any credential options and never authenticates."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        return None
+
+
+class FakeOpenAIClient:
+    """Serves conversations and responses for prompt agents registered on a FakeProjectClient.
+
+    A response to new input from an agent with tools asks for ``tool_calls_per_turn``
+    function calls; a response that follows up on a previous one (carrying the
+    function outputs) is the agent's text reply. Each response takes ``run_latency``
+    plus one ``token_delay`` per word it writes. Service calls are recorded as
+    ``<stage_prefix>.<call>`` in ``stages``.
+    """
+
+    def __init__(self, project: "FakeProjectClient"):
+        self._project = project
+        self.conversations = SimpleNamespace(create=self._create_conversation, items=SimpleNamespace(create=self._create_items))
+        self.responses = SimpleNamespace(create=self._create_response)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        return None
+
+    def _create_conversation(self, **kwargs):
+        self._project._call("conversations.create")
+        conversation_id = self._project._next_id("conv")
+        self._project._items[conversation_id] = []
+        return SimpleNamespace(id=conversation_id)
+
+    def _create_items(self, conversation_id: str, items: list, **kwargs):
+        self._project._call("conversations.items.create")
+        self._project._items.setdefault(conversation_id, []).extend(items)
+        return SimpleNamespace(data=items)
+
+    def _create_response(self, input=None, conversation: str | None = None, previous_response_id: str | None = None,
+                         extra_body: dict | None = None, **kwargs):
+        project = self._project
+        agent_name = ((extra_body or {}).get("agent") or {}).get("name")
+        tools = project._agents.get(agent_name, [])
+
+        if previous_response_id is None and tools and project.tool_calls_per_turn:
+            # Ask for the agent's tools before answering
+            calls = [tools[i % len(tools)] for i in range(project.tool_calls_per_turn)]
+            output = [
+                SimpleNamespace(type="function_call", name=name, arguments=json.dumps({}), call_id=project._next_id("call"))
+                for name in calls
+            ]
+            project._call("responses.create", project.run_latency + len(calls) * project.token_delay)
+            return SimpleNamespace(id=project._next_id("resp"), status="completed", error=None, output=output, output_text="")
+
+        project._call("responses.create", project.run_latency + project.generation_time())
+        message = SimpleNamespace(type="message", role="assistant", content=[SimpleNamespace(type="output_text", text=project.reply)])
+        if conversation is not None:
+            project._items.setdefault(conversation, []).append(message)
+        return SimpleNamespace(id=project._next_id("resp"), status="completed", error=None, output=[message], output_text=project.reply)
+
+
+class FakeProjectClient:
+    """Blocking stand-in for azure.ai.projects.AIProjectClient with prompt agents and an OpenAI client."""
+
+    def __init__(self, endpoint: str | None = None, credential=None, api_latency: float = 0.01, run_latency: float = 0.3,
+                 token_delay: float = 0.0, reply: str = "Fake agent reply", tool_calls_per_turn: int = 1,
+                 stages: StageTimer | None = None, stage_prefix: str = "project", **kwargs):
+        self.api_latency = api_latency
+        self.run_latency = run_latency
+        self.token_delay = token_delay
+        self.reply = reply
+        self.tool_calls_per_turn = tool_calls_per_turn
+        self.stages = stages or StageTimer()
+        self.stage_prefix = stage_prefix
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+        self._agents: dict[str, list[str]] = {}
+        self._items: dict[str, list] = {}
+
+        self.agents = SimpleNamespace(create_version=self._create_version, delete_version=self._delete_version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        return None
+
+    def _next_id(self, prefix: str) -> str:
+        with self._ids_lock:
+            return f"{prefix}_{next(self._ids)}"
+
+    def _call(self, name: str, seconds: float = 0.0) -> None:
+        with self.stages.time(f"{self.stage_prefix}.{name}"):
+            time.sleep(self.api_latency + seconds)
+
+    def generation_time(self) -> float:
+        return len(self.reply.split(" ")) * self.token_delay
+
+    def get_openai_client(self) -> FakeOpenAIClient:
+        return FakeOpenAIClient(self)
+
+    def _create_version(self, agent_name: str, definition, **kwargs):
+        self._call("agents.create_version")
+        self._agents[agent_name] = [getattr(tool, "name", None) or tool["name"] for tool in getattr(definition, "tools", None) or []]
+        return SimpleNamespace(id=self._next_id("agent"), name=agent_name, version="1")
+
+    def _delete_version(self, agent_name: str, agent_version: str, **kwargs):
+        self._call("agents.delete_version")
+        self._agents.pop(agent_name, None)
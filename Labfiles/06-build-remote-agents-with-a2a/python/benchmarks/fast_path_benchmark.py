@@ -0,0 +1,118 @@
+""" Offline accuracy and latency of the local routing fast path
+
+Builds the skill index from the cards in agents.json and classifies a
+labelled set of messages. A message labelled None should be left to the
+router model (off-topic, or asking for several agents at once). For each
+threshold/margin pair it reports:
+
+- coverage: share of messages routed locally;
+- recall: share of single-agent messages routed locally to the right agent;
+- precision: share of local routes that went to the right agent;
+- misroutes: messages routed locally to the wrong agent (or that should
+  have gone to the router model);
+- classification latency.
+
+Run from the python folder:
+
+    python -m benchmarks.fast_path_benchmark
+"""
+
+import argparse
+import json
+import os
+import time
+
+from agent_host.config import load_agent_specs
+from benchmarks.stats import percentile
+from routing_agent.fast_path import SkillIndex
+
+TITLE = "Microsoft Foundry Title Agent"
+OUTLINE = "AI Foundry Outline Agent"
+
+LABELLED_MESSAGES = [
+    ("Give me a catchy title for my post about solar energy", TITLE),
+    ("I need a title for an article on remote work", TITLE),
+    ("Suggest a headline for my blog about sourdough baking", TITLE),
+    ("What should I call my post on electric cars?", TITLE),
+    ("Title ideas for a piece about learning Rust", TITLE),
+    ("Can you name my blog post about hiking in Norway?", TITLE),
+    ("Come up with a catchy headline on the future of work", TITLE),
+    ("Blog title for: why sleep matters", TITLE),
+    ("A title please, topic is budget travel in Asia", TITLE),
+    ("Could you suggest titles for a post on home composting?", TITLE),
+    ("Headline for my newsletter about stock market basics", TITLE),
+    ("Outline an article on remote work", OUTLINE),
+    ("Write an outline for a blog post about solar energy", OUTLINE),
+    ("What sections should my blog about cats have?", OUTLINE),
+    ("Help me structure a post on machine learning basics", OUTLINE),
+    ("Give me an outline for my article on sourdough baking", OUTLINE),
+    ("I need key sections for a post about electric cars", OUTLINE),
+    ("Structure for a blog about learning Rust", OUTLINE),
+    ("Outline please: the history of jazz", OUTLINE),
+    ("Break down a post on hiking in Norway into sections", OUTLINE),
+    ("Plan the structure of an article about budget travel", OUTLINE),
+    ("Can you draft an outline on home composting?", OUTLINE),
+    ("I need a title and an outline for a post on AI", None),
+    ("Give me a headline and the main sections for my article on coffee", None),
+    ("Hello there", None),
+    ("What's the weather like today?", None),
+    ("Translate this paragraph into French", None),
+    ("Summarize the news about electric cars", None),
+    ("Thanks, that was helpful", None),
+    ("Write the full blog post about solar energy", None),
+]
+
+
+def evaluate(index: SkillIndex, repeats: int) -> dict:
+    routed = correct = misroutes = 0
+    latencies = []
+    for message, expected in LABELLED_MESSAGES:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            decision = index.classify(message)
+            latencies.append(time.perf_counter() - start)
+        if decision.agent_name is None:
+            continue
+        routed += 1
+        if decision.agent_name == expected:
+            correct += 1
+        else:
+            misroutes += 1
+
+    routable = sum(1 for _, expected in LABELLED_MESSAGES if expected)
+    return {
+        "threshold": index.threshold,
+        "margin": index.margin,
+        "coverage": round(routed / len(LABELLED_MESSAGES), 3),
+        "recall": round(correct / routable, 3),
+        "precision": round(correct / routed, 3) if routed else None,
+        "misroutes": misroutes,
+        "p50_us": round(percentile(latencies, 50) * 1e6, 1),
+        "p99_us": round(percentile(latencies, 99) * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the routing fast path")
+    parser.add_argument("--thresholds", default="0.2,0.3,0.4,0.5")
+    parser.add_argument("--margins", default="0.1,0.2,0.3")
+    parser.add_argument("--repeats", type=int, default=200, help="classifications per message for timing")
+    args = parser.parse_args()
+
+    # Cards only need a port to render their URL
+    os.environ.setdefault("TITLE_AGENT_PORT", "0")
+    os.environ.setdefault("OUTLINE_AGENT_PORT", "0")
+    cards = [spec.card("localhost") for spec in load_agent_specs()]
+
+    results = []
+    for threshold in map(float, args.thresholds.split(",")):
+        for margin in map(float, args.margins.split(",")):
+            index = SkillIndex(threshold=threshold, margin=margin)
+            index.build(cards)
+            results.append(evaluate(index, args.repeats))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
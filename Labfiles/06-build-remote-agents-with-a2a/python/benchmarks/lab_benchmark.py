@@ -0,0 +1,346 @@
+""" Load benchmark of the lab flows against local stand-ins for Foundry
+
+Replaces the Foundry services with in-process fakes that have configurable
+service latency, time to first token and token rate, then drives:
+
+- topology: the run_all.py topology in-process: the title and outline A2A
+  servers and the routing agent's /message endpoint, over real HTTP;
+- mcp: the inventory chat loop from 03-mcp-integration, one loop per
+  simulated user, against a fake MCP session;
+- triage: the connected-agents ticket triage script from
+  03b-build-multi-agent-solution, one run per ticket.
+
+For each flow it prints throughput, p50/p95/p99 latency and a per-stage
+breakdown (service calls, model runs, A2A hops, tool calls) as JSON. The MCP
+and triage flows need their lab's requirements installed; a flow whose lab
+cannot be imported is reported as skipped.
+
+Run from the python folder:
+
+    python -m benchmarks.lab_benchmark --flows topology,mcp,triage --requests 50 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import functools
+import importlib.util
+import json
+import os
+import runpy
+import socket
+import tempfile
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_agents import FakeAgentsClient, FakeSyncAgentsClient
+from benchmarks.fake_openai import FakeCredential, FakeProjectClient
+from benchmarks.stats import StageTimer, summarize
+
+LABFILES = Path(__file__).resolve().parents[3]
+MCP_CLIENT = LABFILES / "03-mcp-integration" / "Python" / "client.py"
+TRIAGE_SCRIPT = LABFILES / "03b-build-multi-agent-solution" / "Python" / "agent_triage.py"
+
+INVENTORY = {"Moisturizer": 6, "Shampoo": 8, "Body Spray": 28, "Hair Gel": 5, "Lip Balm": 12}
+WEEKLY_SALES = {"Moisturizer": 22, "Shampoo": 18, "Body Spray": 3, "Hair Gel": 2, "Lip Balm": 14}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _silent(*args, **kwargs) -> None:
+    return None
+
+
+class ScriptedInput:
+    """Stands in for input(): returns each prompt, then 'quit', timing the turns in between."""
+
+    def __init__(self, prompts: list[str], stages: StageTimer, stage: str):
+        self._prompts = list(prompts)
+        self._stages = stages
+        self._stage = stage
+        self._turn_started: float | None = None
+        self.turns: list[float] = []
+
+    def __call__(self, prompt: str = "") -> str:
+        now = time.perf_counter()
+        if self._turn_started is not None:
+            self.turns.append(now - self._turn_started)
+            self._stages.record(self._stage, now - self._turn_started)
+            self._turn_started = None
+        if not self._prompts:
+            return "quit"
+        self._turn_started = now
+        return self._prompts.pop(0)
+
+
+class FakeMCPSession:
+    """The inventory MCP server's tools, served in-process after ``tool_latency``."""
+
+    def __init__(self, tool_latency: float, stages: StageTimer):
+        self.tool_latency = tool_latency
+        self.stages = stages
+        self._tools = {
+            "get_inventory_levels": ("Returns current inventory for all products.", INVENTORY),
+            "get_weekly_sales": ("Returns number of units sold last week.", WEEKLY_SALES),
+        }
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=[SimpleNamespace(name=name, description=description) for name, (description, _) in self._tools.items()])
+
+    async def call_tool(self, name: str, arguments: dict):
+        with self.stages.time(f"mcp.{name}"):
+            await asyncio.sleep(self.tool_latency)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=json.dumps(self._tools[name][1]))])
+
+
+def _settings(args) -> dict:
+    # Fake model settings shared by every flow
+    return {
+        "api_latency": args.api_latency,
+        "run_latency": args.run_latency,
+        "token_delay": 1 / args.tokens_per_second if args.tokens_per_second > 0 else 0.0,
+        # A first line of its own, like a title above the body
+        "reply": "Fake title line\n" + " ".join(["word"] * args.reply_words),
+    }
+
+
+def _lab_fakes(args, stages: StageTimer) -> ExitStack:
+    # Swap the SDK entry points the lab scripts import for the fakes
+    settings = _settings(args)
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(os, "system", lambda command: 0))
+    stack.enter_context(mock.patch("azure.identity.DefaultAzureCredential", FakeCredential))
+    stack.enter_context(mock.patch("azure.ai.projects.AIProjectClient", functools.partial(
+        FakeProjectClient, tool_calls_per_turn=args.mcp_tool_calls, stages=stages, **settings)))
+    stack.enter_context(mock.patch("azure.ai.agents.AgentsClient", functools.partial(
+        FakeSyncAgentsClient, stages=stages, **settings)))
+    return stack
+
+
+def _flow_result(latencies: list[float], wall_time: float, errors: int, stages: StageTimer) -> dict:
+    return {**summarize(latencies, wall_time), "errors": errors, "stages": stages.summary()}
+
+
+async def run_topology(args) -> dict:
+    """Route requests through the routing server to the title and outline A2A servers."""
+
+    # Keep the lab's own agent card cache and task database out of the benchmark
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {
+        "A2A_CARD_CACHE": os.path.join(tmp, "agent_cards.json"),
+        "AGENT_TASK_STORE_PATH": os.path.join(tmp, "agent_tasks.db"),
+    }):
+        return await _run_topology(args)
+
+
+async def _run_topology(args) -> dict:
+    from agent_host.config import load_agent_specs
+    from agent_host.host import AgentHost
+    from routing_agent import server as routing_server
+    from routing_agent.agent import RoutingAgent
+    from routing_agent.transport import AgentTransportPool
+
+    stages = StageTimer()
+    settings = _settings(args)
+
+    # Specialist agents on the fake agents service
+    os.environ["TITLE_AGENT_PORT"] = str(_free_port())
+    os.environ["OUTLINE_AGENT_PORT"] = str(_free_port())
+    specialist = FakeAgentsClient(tool_calls_per_run=0, stages=stages, stage_prefix="specialist", **settings)
+    agent_host = AgentHost(load_agent_specs(), "127.0.0.1", client=specialist)
+    servers = [
+        uvicorn.Server(uvicorn.Config(agent_host.build_app(spec.key), host="127.0.0.1", port=spec.port, log_level="warning"))
+        for spec in agent_host.specs.values()
+    ]
+
+    # The routing agent on its own fake service, each run delegating to the specialists
+    router = FakeAgentsClient(tool_calls_per_run=args.tool_calls, tool_call_mode=args.tool_call_mode,
+                              stages=stages, stage_prefix="router", **settings)
+    transport = AgentTransportPool.from_env()
+    routing_agent = RoutingAgent(agents_client=router, transport=transport)
+
+    # Time each A2A hop
+    delegate = routing_agent._delegate
+
+    async def timed_delegate(client, task):
+        with stages.time(f"a2a.{client.name}"):
+            return await delegate(client, task)
+    routing_agent._delegate = timed_delegate
+
+    # Serve the routing endpoints without their lifespan, which would connect to Foundry
+    routing_server.routing_agent = routing_agent
+    routing_server.transport = transport
+    routing_port = _free_port()
+    servers.append(uvicorn.Server(uvicorn.Config(routing_server.app, host="127.0.0.1", port=routing_port, log_level="warning", lifespan="off")))
+
+    tasks = [asyncio.create_task(server.serve()) for server in servers[:-1]]
+    while not all(server.started for server in servers[:-1]):
+        await asyncio.sleep(0.01)
+    await routing_agent._async_init_components([f"http://127.0.0.1:{spec.port}" for spec in agent_host.specs.values()])
+    await routing_agent.create_agent()
+    tasks.append(asyncio.create_task(servers[-1].serve()))
+    while not servers[-1].started:
+        await asyncio.sleep(0.01)
+
+    latencies: list[float] = []
+    errors = shed = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    run_id = uuid.uuid4().hex[:8]
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{routing_port}", timeout=120) as http_client:
+
+        async def one_request(i: int) -> None:
+            nonlocal errors, shed
+            payload = {"message": f"Write a title and an outline for post {run_id}-{i}", "session_id": f"session-{i % args.concurrency}", "no_cache": not args.cache}
+            async with semaphore:
+                start = time.perf_counter()
+                response = await http_client.post("/message", json=payload)
+                elapsed = time.perf_counter() - start
+
+            # Requests turned away by admission control are counted apart from served ones
+            if response.status_code == 429:
+                shed += 1
+                stages.record("shed", elapsed)
+                return
+            latencies.append(elapsed)
+            stages.record("request", elapsed)
+            if response.status_code != 200 or "error" in response.json():
+                errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request(i) for i in range(args.requests)))
+        wall_time = time.perf_counter() - start
+
+    for server in servers:
+        server.should_exit = True
+    await asyncio.gather(*tasks)
+    await routing_agent.close()
+    await transport.close()
+    await agent_host.close()
+    return {**_flow_result(latencies, wall_time, errors, stages), "shed": shed, "admission": routing_server.admission.stats(),
+            "pipelines": routing_server.routing_agent.pipeline_runner.stats()}
+
+
+def _run_mcp_loop(args, stages: StageTimer, user: int, turns: int) -> list[float]:
+    # Load a private copy of the lab's client so each simulated user has its own input()
+    spec = importlib.util.spec_from_file_location(f"mcp_lab_client_{user}", MCP_CLIENT)
+    module = importlib.util.module_from_spec(spec)
+    module.print = _silent
+    spec.loader.exec_module(module)
+    module.input = ScriptedInput([f"Which products should user {user} restock? ({turn})" for turn in range(turns)], stages, "turn")
+    asyncio.run(module.chat_loop(FakeMCPSession(args.tool_latency, stages)))
+    return module.input.turns
+
+
+def run_mcp(args) -> dict:
+    """Run one inventory chat loop per simulated user, splitting the requests between them."""
+
+    stages = StageTimer()
+    users = min(args.concurrency, args.requests)
+    turns = [args.requests // users + (1 if user < args.requests % users else 0) for user in range(users)]
+    latencies: list[float] = []
+    errors = 0
+
+    with _lab_fakes(args, stages), ThreadPoolExecutor(max_workers=users) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(_run_mcp_loop, args, stages, user, count) for user, count in enumerate(turns)]
+        for future in futures:
+            try:
+                latencies.extend(future.result())
+            except ModuleNotFoundError:
+                raise
+            except Exception as e:
+                print(f"MCP loop failed: {e}")
+                errors += 1
+        wall_time = time.perf_counter() - start
+    return _flow_result(latencies, wall_time, errors, stages)
+
+
+def _run_triage(stages: StageTimer, ticket: int) -> float:
+    start = time.perf_counter()
+    runpy.run_path(str(TRIAGE_SCRIPT), init_globals={
+        "print": _silent,
+        "input": ScriptedInput([f"Users can't reset their password (ticket {ticket})"], stages, "prompt"),
+    })
+    elapsed = time.perf_counter() - start
+    stages.record("flow", elapsed)
+    return elapsed
+
+
+def run_triage(args) -> dict:
+    """Run the triage script once per request, ``concurrency`` at a time."""
+
+    stages = StageTimer()
+    latencies: list[float] = []
+    errors = 0
+
+    with _lab_fakes(args, stages), ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(_run_triage, stages, ticket) for ticket in range(args.requests)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except ModuleNotFoundError:
+                raise
+            except Exception as e:
+                print(f"Triage run failed: {e}")
+                errors += 1
+        wall_time = time.perf_counter() - start
+    return _flow_result(latencies, wall_time, errors, stages)
+
+
+FLOWS = {
+    "topology": lambda args: asyncio.run(run_topology(args)),
+    "mcp": run_mcp,
+    "triage": run_triage,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark of the lab flows against local Foundry fakes")
+    parser.add_argument("--flows", default="topology,mcp,triage", help=f"comma-separated list of: {', '.join(FLOWS)}")
+    parser.add_argument("--requests", type=int, default=50, help="requests (topology), chat turns (mcp) or tickets (triage) per flow")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests, users or tickets in flight at once")
+    parser.add_argument("--api-latency", type=float, default=0.01, help="seconds per service call")
+    parser.add_argument("--run-latency", type=float, default=0.3, help="seconds before a model run starts writing")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="model output rate; 0 writes replies instantly")
+    parser.add_argument("--reply-words", type=int, default=40, help="words in each model reply")
+    parser.add_argument("--tool-calls", type=int, default=2, help="send_message calls per routing run (topology)")
+    parser.add_argument("--tool-call-mode", choices=["parallel", "sequential", "pipeline"], default="parallel",
+                        help="routing runs call the agents in one model turn, one turn per agent, or via run_pipeline (topology)")
+    parser.add_argument("--mcp-tool-calls", type=int, default=2, help="MCP tool calls per chat turn (mcp)")
+    parser.add_argument("--tool-latency", type=float, default=0.02, help="seconds per MCP tool call (mcp)")
+    parser.add_argument("--cache", action="store_true", help="let the routing agent reuse cached delegations (topology)")
+    parser.add_argument("--output", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # The routing and specialist agents only read these to name a model
+    os.environ.setdefault("MODEL_DEPLOYMENT_NAME", "benchmark-model")
+    os.environ.setdefault("SERVER_URL", "127.0.0.1")
+
+    results = {"settings": vars(args), "flows": {}}
+    for name in args.flows.split(","):
+        try:
+            results["flows"][name] = FLOWS[name](args)
+        except ModuleNotFoundError as e:
+            results["flows"][name] = {"skipped": f"lab requirements not installed ({e})"}
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
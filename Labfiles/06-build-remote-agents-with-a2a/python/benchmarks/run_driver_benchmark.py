@@ -0,0 +1,95 @@
+""" Benchmarks the routing agent's run drivers against the fake agents service
+
+Run from the python folder:
+
+    python -m benchmarks.run_driver_benchmark --requests 100 --concurrency 25
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.fake_agents import FakeAgentsClient
+from benchmarks.stats import summarize
+from routing_agent.agent import RoutingAgent
+from routing_agent.run_driver import ACTIVE_RUN_STATUSES, PollingRunDriver, RunDriver, StreamingRunDriver
+
+
+class BlockingRunDriver(RunDriver):
+    """The original loop: time.sleep(1) between status checks, blocking the event loop."""
+
+    async def drive(self, agents_client, thread_id, agent_id, handle_tool_calls, on_event=None, **run_options):
+        run = await agents_client.runs.create(thread_id=thread_id, agent_id=agent_id, **run_options)
+        while run.status in ACTIVE_RUN_STATUSES:
+            time.sleep(1)
+            run = await agents_client.runs.get(thread_id=thread_id, run_id=run.id)
+            if run.status == "requires_action":
+                tool_outputs = await handle_tool_calls(run.required_action.submit_tool_outputs.tool_calls)
+                await agents_client.runs.submit_tool_outputs(thread_id=thread_id, run_id=run.id, tool_outputs=tool_outputs)
+        return run
+
+
+DRIVERS = {
+    "stream": StreamingRunDriver,
+    "poll": PollingRunDriver,
+    "blocking": BlockingRunDriver,
+}
+
+
+async def run_benchmark(driver_name: str, args) -> dict:
+    fake = FakeAgentsClient(api_latency=args.api_latency, run_latency=args.run_latency, tool_calls_per_run=args.tool_calls)
+    agent = RoutingAgent(run_driver=DRIVERS[driver_name](), agents_client=fake)
+    await agent.create_agent()
+
+    # Stand in for the remote A2A agent
+    async def fake_send_message(agent_name: str, task: str):
+        await asyncio.sleep(args.remote_latency)
+        return f"{agent_name} handled: {task}"
+    agent.send_message = fake_send_message
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one_request(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await agent.process_user_message(f"benchmark request {i}", session_id=f"session-{i % args.sessions}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(args.requests)))
+    wall_time = time.perf_counter() - start
+
+    result = {"driver": driver_name, **summarize(latencies, wall_time), "peak_in_flight": fake.peak_active_runs}
+    result["service_calls"] = dict(fake.calls)
+    await agent.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark routing agent run drivers")
+    parser.add_argument("--drivers", default="stream,poll,blocking", help="comma-separated list of drivers")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--run-latency", type=float, default=0.3, help="seconds per run phase")
+    parser.add_argument("--api-latency", type=float, default=0.01, help="seconds per service call")
+    parser.add_argument("--remote-latency", type=float, default=0.2, help="seconds per remote agent call")
+    parser.add_argument("--sessions", type=int, default=1000, help="distinct user sessions to spread requests over")
+    parser.add_argument("--tool-calls", type=int, default=1, help="send_message calls per run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_benchmark(name, args)) for name in args.drivers.split(",")]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'driver':<10}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'in flight':>11}")
+    for r in results:
+        print(f"{r['driver']:<10}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['throughput_rps']:>10}{r['peak_in_flight']:>11}")
+
+
+if __name__ == "__main__":
+    main()
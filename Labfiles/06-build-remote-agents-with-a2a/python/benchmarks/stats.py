@@ -0,0 +1,66 @@
+""" Latency summaries shared by the benchmark scripts """
+
+import math
+import threading
+import time
+
+from contextlib import contextmanager
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: list[float], wall_time: float) -> dict:
+    """Summarize request latencies (seconds) into a JSON-friendly dict of milliseconds."""
+    return {
+        "requests": len(latencies),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(latencies) / wall_time, 2) if wall_time else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+    }
+
+
+class StageTimer:
+    """Collects latencies per named stage of a flow (e.g. one service call or one hop)."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        # Flows run on threads as well as on the event loop
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self) -> dict:
+        """Count, total and percentiles (milliseconds) for each stage, slowest total first."""
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self.samples.items()}
+        stages = {
+            stage: {
+                "count": len(values),
+                "total_s": round(sum(values), 3),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+            }
+            for stage, values in samples.items()
+        }
+        return dict(sorted(stages.items(), key=lambda item: item[1]["total_s"], reverse=True))
@@ -0,0 +1,104 @@
+""" Sustained-load benchmark for the A2A task stores
+
+Saves a stream of tasks (submitted, working, completed) into each store and
+reports Python heap growth, save/get latency and, for SQLite, how fast lookups
+are after reopening the file as a restarted server would.
+
+Run from the python folder:
+
+    python -m benchmarks.task_store_benchmark --tasks 50000 --max-tasks 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Task, TaskState, TaskStatus
+from a2a.utils import new_agent_text_message
+from agent_host.task_store import SQLiteTaskStore
+from benchmarks.stats import summarize
+
+
+def _task(task_id: str, context_id: str, state: TaskState) -> Task:
+    message = new_agent_text_message("A catchy blog title " * 5, context_id=context_id, task_id=task_id)
+    return Task(id=task_id, context_id=context_id, status=TaskStatus(state=state, message=message), history=[message])
+
+
+async def _load(store, tasks: int, contexts: int) -> tuple[list[float], list[str], float]:
+    latencies, task_ids = [], []
+    start = time.perf_counter()
+    for i in range(tasks):
+        task_id, context_id = str(uuid.uuid4()), f"context-{i % contexts}"
+        for state in (TaskState.submitted, TaskState.working, TaskState.completed):
+            t0 = time.perf_counter()
+            await store.save(_task(task_id, context_id, state))
+            latencies.append(time.perf_counter() - t0)
+        task_ids.append(task_id)
+    return latencies, task_ids, time.perf_counter() - start
+
+
+async def _lookups(store, task_ids: list[str]) -> list[float]:
+    latencies = []
+    for task_id in task_ids:
+        t0 = time.perf_counter()
+        await store.get(task_id)
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+async def bench_store(name: str, make_store, args) -> dict:
+    tracemalloc.start()
+    store = make_store()
+    latencies, task_ids, wall_time = await _load(store, args.tasks, args.contexts)
+    heap_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+
+    recent = task_ids[-args.lookups:]
+    result = {
+        "store": name,
+        "heap_mb": round(heap_mb, 1),
+        "save": summarize(latencies, wall_time),
+        "get": summarize(await _lookups(store, recent), 1.0),
+    }
+
+    if isinstance(store, SQLiteTaskStore):
+        result["rows"] = store.count()
+        store.close()
+
+        # Reopen the same file, as a restarted server would
+        t0 = time.perf_counter()
+        reopened = make_store()
+        result["reopen_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        result["get_after_restart"] = summarize(await _lookups(reopened, recent), 1.0)
+        reopened.close()
+    return result
+
+
+async def run_benchmark(args) -> list[dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.db")
+        return [
+            await bench_store("memory", InMemoryTaskStore, args),
+            await bench_store("sqlite", lambda: SQLiteTaskStore(path, max_tasks=args.max_tasks), args),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task store memory and latency under sustained load")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--contexts", type=int, default=500)
+    parser.add_argument("--max-tasks", type=int, default=5000, help="SQLite size cap")
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
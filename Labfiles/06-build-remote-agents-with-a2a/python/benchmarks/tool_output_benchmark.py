@@ -0,0 +1,93 @@
+""" Size and cost of the tool output the router model reads for each delegation
+
+Builds the Task a streaming specialist leaves behind (history, status message
+and an artifact made of many streamed chunks) and serializes it the way the
+lab originally did (``json.dumps(task.model_dump())``) and with each
+ToolOutputProjection mode. Reports output size, a rough token estimate
+(4 characters per token), serialization time and peak memory per call.
+
+Run from the python folder:
+
+    python -m benchmarks.tool_output_benchmark --reply-words 400 --chunks 200
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+
+from a2a.types import Artifact, Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+from a2a.utils import new_agent_text_message
+from benchmarks.stats import summarize
+from routing_agent.tool_output import ToolOutputProjection
+
+
+def _task(reply_words: int, chunks: int) -> Task:
+    task_id, context_id = str(uuid.uuid4()), str(uuid.uuid4())
+    reply = "Title line\n" + " ".join(f"word{i}" for i in range(reply_words))
+    size = max(1, len(reply) // chunks)
+    parts = [Part(root=TextPart(text=reply[i:i + size])) for i in range(0, len(reply), size)]
+
+    request = Message(role=Role.user, parts=[Part(root=TextPart(text="Write a blog post about hiking"))],
+                      message_id=str(uuid.uuid4()), task_id=task_id, context_id=context_id,
+                      metadata={"traceparent": f"00-{uuid.uuid4().hex}-{uuid.uuid4().hex[:16]}-01"})
+    working = new_agent_text_message("Processing request...", context_id=context_id, task_id=task_id)
+    final = new_agent_text_message(reply, context_id=context_id, task_id=task_id)
+    return Task(
+        id=task_id,
+        context_id=context_id,
+        status=TaskStatus(state=TaskState.completed, message=final),
+        history=[request, working],
+        artifacts=[Artifact(artifact_id=str(uuid.uuid4()), name="response", parts=parts)],
+    )
+
+
+def _legacy(task: Task) -> str:
+    return json.dumps(task.model_dump())
+
+
+def bench(name: str, serialize, task: Task, iterations: int) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        output = serialize(task)
+        latencies.append(time.perf_counter() - t0)
+    wall_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    serialize(task)
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1e3
+    tracemalloc.stop()
+
+    return {
+        "format": name,
+        "chars": len(output),
+        "approx_tokens": len(output) // 4,
+        "peak_kb": round(peak_kb, 1),
+        "serialize": summarize(latencies, wall_time),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Router tool output size and serialization cost")
+    parser.add_argument("--reply-words", type=int, default=400)
+    parser.add_argument("--chunks", type=int, default=200, help="streamed artifact chunks")
+    parser.add_argument("--max-chars", type=int, default=8000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    task = _task(args.reply_words, args.chunks)
+    text = ToolOutputProjection(mode="text", max_chars=args.max_chars)
+    full = ToolOutputProjection(mode="full", max_chars=args.max_chars)
+    results = [
+        bench("legacy", _legacy, task, args.iterations),
+        bench("full", lambda t: full.task("agent", t), task, args.iterations),
+        bench("text", lambda t: text.task("agent", t), task, args.iterations),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """ Client code that connects to the routing agent """
 
 import os
+import sys
+import json
+import uuid
 import asyncio
 import requests
 from dotenv import load_dotenv
@@ -10,27 +13,80 @@ load_dotenv()
 server = os.environ["SERVER_URL"]
 port = os.environ["ROUTING_AGENT_PORT"]
 
+# Identifies this client's conversation to the routing agent
+session_id = str(uuid.uuid4())
+
 def send_prompt(prompt: str):
     url = f"http://{server}:{port}/message"
-    payload = {"message": prompt}
+    payload = {"message": prompt, "session_id": session_id}
     try:
         response = requests.post(url, json=payload)
         if response.status_code == 200:
             return response.json().get("response", "No response from agent.")
+        elif response.status_code == 429:
+            return f"The agent is busy. Try again in {response.headers.get('Retry-After', 'a few')} seconds."
         else:
             return f"Error {response.status_code}: {response.text}"
     except Exception as e:
         return f"Request failed: {e}"
 
+def stream_prompt(prompt: str):
+    # Print router tokens and remote agent updates as they arrive
+    url = f"http://{server}:{port}/message/stream"
+    payload = {"message": prompt, "session_id": session_id}
+    try:
+        with requests.post(url, json=payload, stream=True) as response:
+            if response.status_code == 429:
+                print(f"Agent: The agent is busy. Try again in {response.headers.get('Retry-After', 'a few')} seconds.")
+                return
+            if response.status_code != 200:
+                print(f"Agent: Error {response.status_code}: {response.text}")
+                return
+
+            streamed_text = False
+            streaming_agent = None
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):].strip())
+
+                # End the line of a remote agent's streamed output before anything else is printed
+                if streaming_agent and (event["type"] != "agent_delta" or event["agent"] != streaming_agent):
+                    print(flush=True)
+                    streaming_agent = None
+
+                if event["type"] == "status":
+                    print(f"  [{event['agent']}] {event['text']}", flush=True)
+                elif event["type"] == "agent_delta":
+                    if streaming_agent != event["agent"]:
+                        print(f"  [{event['agent']}] ", end="", flush=True)
+                        streaming_agent = event["agent"]
+                    print(event["text"], end="", flush=True)
+                elif event["type"] == "delta":
+                    if not streamed_text:
+                        print("Agent: ", end="", flush=True)
+                        streamed_text = True
+                    print(event["text"], end="", flush=True)
+                elif event["type"] == "done":
+                    # Deltas already showed the answer; otherwise print it in full
+                    print("" if streamed_text else f"Agent: {event['response']}")
+    except Exception as e:
+        print(f"Request failed: {e}")
+
 async def main():
+    # Pass --no-stream to wait for each complete response instead of streaming it
+    streaming = "--no-stream" not in sys.argv[1:]
+
     print("Enter a prompt for the agent. Type 'quit' to exit.")
     while True:
         user_input = input("User: ")
         if user_input.lower() == "quit":
             print("Goodbye!")
             break
-        response = send_prompt(user_input)
-        print(f"Agent: {response}")
+        if streaming:
+            stream_prompt(user_input)
+        else:
+            print(f"Agent: {send_prompt(user_input)}")
 
 if __name__ == "__main__":
     asyncio.run(main())
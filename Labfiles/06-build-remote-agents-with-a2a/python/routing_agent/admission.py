@@ -0,0 +1,141 @@
+""" Admission control for the routing endpoints: bounded concurrency, a bounded queue and load shedding """
+
+import asyncio
+import math
+import os
+import time
+
+from collections import deque
+from typing import Any
+
+
+class OverloadedError(Exception):
+    """Raised instead of queueing a request that would not be served in time."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Routing agent is overloaded ({reason}); retry in {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Admission:
+    """A slot held by one admitted request; releasing it more than once is harmless."""
+
+    def __init__(self, controller: 'AdmissionController', queued: float):
+        self._controller = controller
+        self.queued = queued
+        self.started = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """Runs at most ``max_concurrent`` requests and queues up to ``max_queued`` more.
+
+    Each request has a deadline (``default_timeout`` seconds unless the caller
+    gives one). A request is shed, without waiting, when the queue is full or
+    when the expected wait plus the expected service time already overruns
+    its deadline. A queued request gives up as soon as it could no longer
+    finish in time. Expected times come from a moving average of how long
+    admitted requests take, so the overload signal follows the actual load.
+    """
+
+    def __init__(self, max_concurrent: int = 16, max_queued: int = 64, default_timeout: float = 60.0, ewma_alpha: float = 0.2):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.default_timeout = default_timeout
+        self.ewma_alpha = ewma_alpha
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.running = 0
+        self.waiting = 0
+        self.service_time: float | None = None
+
+        # Counters and recent queue waits for the metrics endpoint
+        self.admitted = 0
+        self.rejected_full = 0
+        self.shed_deadline = 0
+        self.shed_timeout = 0
+        self.peak_waiting = 0
+        self.waits: deque[float] = deque(maxlen=500)
+
+    @classmethod
+    def from_env(cls) -> 'AdmissionController':
+        return cls(
+            max_concurrent=int(os.getenv("ROUTING_MAX_CONCURRENT", "16")),
+            max_queued=int(os.getenv("ROUTING_MAX_QUEUED", "64")),
+            default_timeout=float(os.getenv("ROUTING_REQUEST_TIMEOUT", "60")),
+        )
+
+    def expected_wait(self, position: int) -> float:
+        # Requests ahead of this one drain max_concurrent at a time
+        if self.service_time is None:
+            return 0.0
+        return math.ceil(position / self.max_concurrent) * self.service_time
+
+    def retry_after(self) -> float:
+        return max(1.0, self.expected_wait(self.waiting + 1) or 1.0)
+
+    async def acquire(self, timeout: float | None = None) -> Admission:
+        """Wait for a slot or raise ``OverloadedError``; the caller must release the result."""
+
+        arrived = time.monotonic()
+        budget = self.default_timeout if timeout is None else timeout
+        service_time = self.service_time or 0.0
+
+        if not self._slots.locked() and self.waiting == 0:
+            await self._slots.acquire()
+            return self._admit(arrived)
+
+        if self.waiting >= self.max_queued:
+            self.rejected_full += 1
+            raise OverloadedError("queue full", self.retry_after())
+
+        # Shed now rather than after a wait that cannot end in time
+        if self.expected_wait(self.waiting + 1) + service_time > budget:
+            self.shed_deadline += 1
+            raise OverloadedError("deadline cannot be met", self.retry_after())
+
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), max(0.0, budget - service_time))
+        except asyncio.TimeoutError:
+            self.shed_timeout += 1
+            raise OverloadedError("timed out in queue", self.retry_after()) from None
+        finally:
+            self.waiting -= 1
+        return self._admit(arrived)
+
+    def _admit(self, arrived: float) -> Admission:
+        self.running += 1
+        self.admitted += 1
+        admission = Admission(self, queued=time.monotonic() - arrived)
+        self.waits.append(admission.queued)
+        return admission
+
+    def _release(self, admission: Admission) -> None:
+        elapsed = time.monotonic() - admission.started
+        self.service_time = elapsed if self.service_time is None else self.ewma_alpha * elapsed + (1 - self.ewma_alpha) * self.service_time
+        self.running -= 1
+        self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self.waits)
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "shed_deadline": self.shed_deadline,
+            "shed_timeout": self.shed_timeout,
+            "service_time_ms": round(self.service_time * 1000, 1) if self.service_time is not None else None,
+            "wait_p50_ms": round(waits[len(waits) // 2] * 1000, 1) if waits else None,
+            "wait_p99_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.99))] * 1000, 1) if waits else None,
+        }
@@ -4,71 +4,239 @@ import os
 import time
 import uuid
 import httpx
+import tracing
 
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
 from typing import Any, Callable
-from azure.ai.agents import AgentsClient
-from azure.identity import DefaultAzureCredential
-from azure.ai.agents.models import ListSortOrder, FunctionTool, MessageRole
+from azure.ai.agents.aio import AgentsClient
+from azure.identity.aio import DefaultAzureCredential
+from azure.ai.agents.models import AgentStreamEvent, ListSortOrder, FunctionTool, MessageRole, TruncationObject
 from collections.abc import Callable
 from dotenv import load_dotenv
-from a2a.client import A2ACardResolver, A2AClient
+from a2a.client import A2AClient
+from a2a.client.client_task_manager import ClientTaskManager
 from a2a.types import (
     AgentCard,
+    JSONRPCErrorResponse,
+    Message,
     MessageSendParams,
     SendMessageRequest,
     SendMessageResponse,
     SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageResponse,
     Task,
     TaskArtifactUpdateEvent,
+    TaskState,
     TaskStatusUpdateEvent,
 )
+from a2a.utils import get_message_text, get_text_parts
+from routing_agent.discovery import AgentCardDiscovery
+from routing_agent.fast_path import SkillIndex
+from routing_agent.pipelines import ChunkCallback, PipelineRunner, load_pipelines
+from routing_agent.replicas import ReplicaPool, with_new_ids
+from routing_agent.resilience import CircuitOpenError, EndpointHealth, ResiliencePolicy
+from routing_agent.result_cache import DelegationResultCache
+from routing_agent.run_driver import RunDriver, create_run_driver
+from routing_agent.sessions import SessionThreadManager
+from routing_agent.single_flight import SingleFlight
+from routing_agent.tool_output import ToolOutputProjection, task_text
+from routing_agent.transport import AgentTransportPool
 
 load_dotenv()
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
+# Receives progress events for the request being streamed by the current task, if any
+_event_sink: ContextVar[asyncio.Queue | None] = ContextVar("routing_event_sink", default=None)
+
+# Set for requests that must reach the remote agents instead of the result cache
+_bypass_cache: ContextVar[bool] = ContextVar("routing_bypass_cache", default=False)
+
+# The routing session of the current request; remote agents get it as the A2A context id
+_session_context: ContextVar[str | None] = ContextVar("routing_session_context", default=None)
+
+# Receives the streamed answer of the delegation made by the current task, if any
+_chunk_listener: ContextVar[ChunkCallback | None] = ContextVar("routing_chunk_listener", default=None)
+
+
+def _emit(event: dict[str, Any]) -> None:
+    sink = _event_sink.get()
+    if sink is not None:
+        sink.put_nowait(event)
+
+
+class RemoteAgentError(Exception):
+    """Raised when a remote agent answers with a JSON-RPC error."""
+
 
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
-        self._httpx_client = httpx.AsyncClient(timeout=30)
+    def __init__(self, agent_card: AgentCard, agent_url: str, httpx_client: httpx.AsyncClient, health: EndpointHealth | None = None):
+        # The httpx client is shared across all remote agents and owned by the transport pool
+        self._httpx_client = httpx_client
         self.agent_client = A2AClient(self._httpx_client, agent_card, url=agent_url)
         self.card = agent_card
+        self.url = agent_url
+
+        # Circuit state and latency history survive card refreshes for the same endpoint
+        self.health = health or EndpointHealth(agent_card.name, ResiliencePolicy.from_env())
 
     def get_agent(self) -> AgentCard:
         return self.card
 
-    async def send_message(self, message_request: SendMessageRequest) -> SendMessageResponse:
-        return await self.agent_client.send_message(message_request)
+    async def send_message(self, message_request: SendMessageRequest, idempotent: bool = False) -> SendMessageResponse:
+        # Fails fast while the circuit is open; idempotent requests may be hedged with a second attempt
+        attempts = 0
+
+        async def attempt() -> SendMessageResponse:
+            nonlocal attempts
+            attempts += 1
+            request = message_request if attempts == 1 else with_new_ids(message_request)
+            with tracing.span("a2a.send_message", agent=self.card.name, url=self.url, attempt=attempts):
+                # Let the remote agent's spans join this trace
+                request.params.message.metadata = tracing.inject(request.params.message.metadata)
+                response = await self.agent_client.send_message(request)
+                if isinstance(response.root, JSONRPCErrorResponse):
+                    raise RemoteAgentError(f"{self.card.name} returned an error: {response.root.error.message}")
+                return response
+
+        return await self.health.call(attempt, idempotent=idempotent)
+
+    async def send_message_streaming(self, message_request: SendStreamingMessageRequest) -> AsyncIterator[SendStreamingMessageResponse]:
+        # Each event must arrive within the adaptive timeout; the whole stream counts as one call
+        self.health.before_call()
+        start = time.monotonic()
+
+        # The span is not made current: the caller runs between the events this generator yields
+        span = tracing.start_span("a2a.send_message_streaming", agent=self.card.name, url=self.url)
+        message_request.params.message.metadata = tracing.inject(message_request.params.message.metadata, span)
+        error = None
+
+        stream = self.agent_client.send_message_streaming(message_request)
+        self.health.outstanding += 1
+        try:
+            while True:
+                try:
+                    response = await asyncio.wait_for(anext(stream), self.health.timeout())
+                except StopAsyncIteration:
+                    break
+                if isinstance(response.root, JSONRPCErrorResponse):
+                    raise RemoteAgentError(f"{self.card.name} returned an error: {response.root.error.message}")
+                yield response
+        except GeneratorExit:
+            # The caller stopped reading early; that says nothing about the agent
+            self.health.release_trial()
+            raise
+        except asyncio.CancelledError as e:
+            error = e
+            self.health.release_trial()
+            raise
+        except Exception as e:
+            error = e
+            self.health.record_failure()
+            raise
+        finally:
+            self.health.outstanding -= 1
+            tracing.end_span(span, error)
+            await stream.aclose()
+        self.health.record_success(time.monotonic() - start)
+
 
 class RoutingAgent:
 
-    def __init__(self,task_callback: TaskUpdateCallback | None = None):
+    def __init__(self,task_callback: TaskUpdateCallback | None = None, run_driver: RunDriver | None = None, agents_client: AgentsClient | None = None, transport: AgentTransportPool | None = None):
 
         self.task_callback = task_callback
-        self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
+        # Each card name maps to the pool of replica endpoints serving it
+        self.remote_agent_connections: dict[str, ReplicaPool] = {}
         self.cards: dict[str, AgentCard] = {}
+        self.replica_policy = os.getenv("ROUTING_REPLICA_POLICY", "least_outstanding")
         self.agents: str = ''
+
+        # Drive runs without blocking the event loop (ROUTING_RUN_DRIVER=stream|poll)
+        self.run_driver = run_driver or create_run_driver(os.getenv("ROUTING_RUN_DRIVER", "stream"))
+
+        # Tool calls in one batch run concurrently, bounded per remote agent and per call
+        self.max_calls_per_agent = int(os.getenv("ROUTING_MAX_CALLS_PER_AGENT", "4"))
+        self.tool_call_timeout = float(os.getenv("ROUTING_TOOL_CALL_TIMEOUT", "60"))
+        self._agent_call_limits: dict[str, asyncio.Semaphore] = {}
+
+        # Keep-alive connection pool shared by card resolution and all remote agents
+        self._owns_transport = transport is None
+        self.transport = transport or AgentTransportPool.from_env()
+
+        # Agent cards are resolved concurrently, cached on disk and refreshed in the background
+        self.discovery = AgentCardDiscovery(
+            self.transport.client,
+            cache_path=os.getenv("A2A_CARD_CACHE", ".agent_cards.json") or None,
+            timeout=float(os.getenv("A2A_CARD_TIMEOUT", "5")),
+            refresh_interval=float(os.getenv("A2A_CARD_REFRESH_INTERVAL", "60")),
+        )
         
-        # Initialize Azure AI Agents client
-        self.agents_client = AgentsClient(
-            endpoint=os.environ["PROJECT_ENDPOINT"],
-            credential=DefaultAzureCredential(
+        # Completed delegations are reused for identical tasks (ROUTING_RESULT_CACHE=0 disables)
+        self.result_cache = None
+        if os.getenv("ROUTING_RESULT_CACHE", "1") != "0":
+            self.result_cache = DelegationResultCache(
+                max_entries=int(os.getenv("ROUTING_RESULT_CACHE_SIZE", "512")),
+                ttl_seconds=float(os.getenv("ROUTING_RESULT_CACHE_TTL", "600")),
+                path=os.getenv("ROUTING_RESULT_CACHE_PATH") or None,
+            )
+
+        # Obvious single-agent requests can skip the router model (ROUTING_FAST_PATH=1)
+        self.fast_path = None
+        if os.getenv("ROUTING_FAST_PATH", "0") == "1":
+            self.fast_path = SkillIndex(
+                threshold=float(os.getenv("ROUTING_FAST_PATH_THRESHOLD", "0.3")),
+                margin=float(os.getenv("ROUTING_FAST_PATH_MARGIN", "0.2")),
+            )
+        self.fast_path_routes = 0
+        self.fast_path_fallbacks = 0
+
+        # Concurrent identical delegations share one remote call
+        self.single_flight = SingleFlight()
+
+        # Only the answer text goes back to the router model (ROUTING_TOOL_OUTPUT=text|full)
+        self.tool_output = ToolOutputProjection.from_env()
+
+        # Declared multi-step delegations run without a router model turn between steps
+        self.pipelines = load_pipelines()
+        self.pipeline_runner = PipelineRunner(
+            self._pipeline_delegate,
+            on_status=lambda agent, text: _emit({"type": "status", "agent": agent, "state": "working", "text": text}),
+        )
+
+        # Initialize the async Azure AI Agents client
+        self._credential = None
+        if agents_client is None:
+            self._credential = DefaultAzureCredential(
                 exclude_environment_credential=True,
                 exclude_managed_identity_credential=True
             )
+            agents_client = AgentsClient(endpoint=os.environ["PROJECT_ENDPOINT"], credential=self._credential)
+        self.agents_client = agents_client
+
+        # One thread per user session, with bounded count, lifetime and history
+        self.sessions = SessionThreadManager(
+            self.agents_client,
+            max_threads=int(os.getenv("ROUTING_MAX_SESSIONS", "256")),
+            ttl_seconds=float(os.getenv("ROUTING_SESSION_TTL", "1800")),
+            max_turns=int(os.getenv("ROUTING_SESSION_MAX_TURNS", "50")),
+        )
+        self.truncation_strategy = TruncationObject(
+            type="last_messages", last_messages=int(os.getenv("ROUTING_HISTORY_MESSAGES", "20"))
         )
 
         self.azure_agent = None
-        self.current_thread = None
 
 
     @classmethod
-    async def create(cls, remote_agent_addresses: list[str], task_callback: TaskUpdateCallback | None = None) -> 'RoutingAgent':
+    async def create(cls, remote_agent_addresses: list[str], task_callback: TaskUpdateCallback | None = None, run_driver: RunDriver | None = None, transport: AgentTransportPool | None = None) -> 'RoutingAgent':
         """Create and asynchronously initialize an instance of the RoutingAgent."""
-        instance = cls(task_callback)
+        instance = cls(task_callback, run_driver=run_driver, transport=transport)
         await instance._async_init_components(remote_agent_addresses)
         return instance
     
@@ -87,22 +255,44 @@ class RoutingAgent:
     async def _async_init_components(self, remote_agent_addresses: list[str]) -> None:
         """Asynchronous part of initialization."""
 
-        # Use a single httpx.AsyncClient for all card resolutions for efficiency
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(client, address)
-                try:
-                    card = await card_resolver.get_agent_card()
-
-                    remote_connection = RemoteAgentConnections(agent_card=card, agent_url=address)
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-
-                except httpx.ConnectError as e:
-                    print( f'ERROR: Failed to get agent card from {address}: {e}')
-                except Exception as e:  # Catch other potential errors
-                    print(f'ERROR: Failed to initialize connection for {address}: {e}')
-            print(f"Found remote agents: {self.list_remote_agents()}")
+        # Resolve all cards concurrently; cached cards are used right away and confirmed later
+        await self.discovery.discover(remote_agent_addresses, self._register_card)
+        print(f"Found remote agents: {self.list_remote_agents()}")
+
+        # Keep picking up agents that come online or change their card
+        self.discovery.start_refresh(self._register_card)
+
+    async def _register_card(self, address: str, card: AgentCard) -> None:
+        # Create (or replace) the connection for the agent served at this address
+
+        agents_before = self.list_remote_agents()
+
+        health = None
+        for name, pool in list(self.remote_agent_connections.items()):
+            existing = pool.get(address)
+            if existing is None:
+                continue
+            health = existing.health
+            if name != card.name:
+                # The address now serves a different agent; leave the old pool
+                pool.remove(address)
+                if not pool:
+                    del self.remote_agent_connections[name]
+                    del self.cards[name]
+
+        remote_connection = RemoteAgentConnections(agent_card=card, agent_url=address, httpx_client=self.transport.client, health=health)
+        pool = self.remote_agent_connections.get(card.name)
+        if pool is None:
+            pool = self.remote_agent_connections[card.name] = ReplicaPool(card.name, policy=self.replica_policy)
+        pool.add(remote_connection)
+        self.cards[card.name] = card
+        if self.fast_path is not None:
+            self.fast_path.build(self.cards.values())
+
+        # Once the router agent exists, tell it about the new set of agents
+        if self.azure_agent and self.list_remote_agents() != agents_before:
+            print(f"Remote agents changed: {self.list_remote_agents()}")
+            await self.agents_client.update_agent(agent_id=self.azure_agent.id, instructions=self._instructions())
 
     
     async def send_message(self, agent_name: str, task: str):
@@ -111,12 +301,36 @@ class RoutingAgent:
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f'Agent {agent_name} not found')
         
-        # Retrieve the remote agent's A2A client using the agent name 
+        # Retrieve the pool of replicas serving this agent name
         client = self.remote_agent_connections[agent_name]
 
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
         
+        # Reuse the result of an identical, already completed delegation in the same session; the
+        # answer depends on the session's conversation with the agent, so sessions never share one
+        key = DelegationResultCache.key(client.card, task, _session_context.get())
+        use_cache = self.result_cache is not None and not _bypass_cache.get()
+        if use_cache:
+            cached = await self.result_cache.get(key)
+            if cached is not None:
+                tracing.annotate(cache="hit")
+                _emit({"type": "status", "agent": agent_name, "state": "completed", "text": "Reused a cached result."})
+                return cached
+
+        # Join an identical delegation that is already in flight instead of sending another
+        if self.single_flight.in_flight(key):
+            tracing.annotate(joined=True)
+            _emit({"type": "status", "agent": agent_name, "state": "working", "text": "Joined an identical request in progress."})
+        result = await self.single_flight.do(key, lambda: self._delegate(client, task))
+
+        if use_cache and isinstance(result, Task):
+            await self.result_cache.put(key, result)
+        return result
+
+    async def _delegate(self, client: ReplicaPool, task: str):
+        # Send one task to the remote agent and return the resulting Task
+
         message_id = str(uuid.uuid4())
 
         # Construct the payload to send to the remote agent
@@ -127,12 +341,27 @@ class RoutingAgent:
                 'messageId': message_id,
             },
         }
+
+        # Let the remote agent keep one conversation (and Foundry thread) per routing session
+        context_id = _session_context.get()
+        if context_id:
+            payload['message']['contextId'] = context_id
+
+        # Without a context a delegation only generates content, so a slow attempt can safely be hedged
+        # or retried. With one, every attempt adds a turn to the session's thread on the remote agent:
+        # a second attempt would queue behind the first on that thread or write a duplicate turn
+        idempotent = not context_id
         
+        # Stream the remote agent's progress when a caller is listening and the agent supports it
+        listening = _event_sink.get() is not None or _chunk_listener.get() is not None
+        if listening and client.card.capabilities.streaming:
+            return await self._send_message_streaming(client, message_id, payload, idempotent)
+
         # Wrap the payload in a SendMessageRequest object
         message_request = SendMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
 
         # Send the message to the remote agent client and await the response
-        send_response: SendMessageResponse = await client.send_message(message_request=message_request)
+        send_response: SendMessageResponse = await client.send_message(message_request=message_request, idempotent=idempotent)
         
         if not isinstance(send_response.root, SendMessageSuccessResponse):
             print('received non-success response. Aborting get task ')
@@ -144,127 +373,313 @@ class RoutingAgent:
 
         return send_response.root.result
 
+    async def _send_message_streaming(self, client: ReplicaPool, message_id: str, payload: dict[str, Any], idempotent: bool):
+        # Send a task over SSE, forwarding status updates and assembling the final Task
 
-    def create_agent(self):
-        # Create an Azure AI Agent instance
-        
+        message_request = SendStreamingMessageRequest(id=message_id, params=MessageSendParams.model_validate(payload))
+        task_manager = ClientTaskManager()
+        streamed = False
+
+        # An idempotent stream may be hedged or retried until its first event
+        stream = client.send_message_streaming(message_request, idempotent=idempotent)
         try:
-            # Create Azure AI Agent with the send_message function
-            functions = FunctionTool({self.send_message})
-            self.azure_agent = self.agents_client.create_agent(
-                model=os.environ["MODEL_DEPLOYMENT_NAME"],
-                name="routing-agent",
-                instructions=f"""
+            async for response in stream:
+                event = response.root.result
+                if isinstance(event, Message):
+                    print('received non-task response. Aborting get task ')
+                    return
+
+                await task_manager.process(event)
+                if self.task_callback:
+                    self.task_callback(event, client.card)
+
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    # Partial output from an agent that streams its response
+                    streamed = True
+                    text = "".join(get_text_parts(event.artifact.parts))
+                    _emit({"type": "agent_delta", "agent": client.card.name, "text": text})
+                    listener = _chunk_listener.get()
+                    if listener is not None:
+                        listener(text, bool(event.last_chunk))
+                elif isinstance(event, TaskStatusUpdateEvent) and event.status.message and not (streamed and event.final):
+                    # The final status repeats streamed output, so it is only forwarded for non-streamed answers
+                    _emit({
+                        "type": "status",
+                        "agent": client.card.name,
+                        "state": event.status.state.value,
+                        "text": get_message_text(event.status.message),
+                    })
+        finally:
+            await stream.aclose()
+
+        return task_manager.get_task()
+
+
+    async def run_pipeline(self, pipeline_name: str, task: str):
+        """Run a multi-step pipeline of remote agents, each step building on the previous answer.
+
+        :param pipeline_name: The name of the pipeline to run.
+        :param task: The user's request, passed to the pipeline's first step.
+        """
+
+        pipeline = self.pipelines.get(pipeline_name)
+        if pipeline is None:
+            raise ValueError(f'Pipeline {pipeline_name} not found')
+
+        with tracing.span("routing.pipeline", pipeline=pipeline_name):
+            steps = await self.pipeline_runner.run(pipeline, task)
+            tracing.annotate(speculative=[step["speculative"] for step in steps[1:]])
+        return {"pipeline": pipeline_name, "steps": steps}
+
+    async def _pipeline_delegate(self, agent_name: str, task: str, on_chunk: ChunkCallback | None = None) -> str:
+        # One pipeline step: delegate the task and return the completed answer's text
+        token = _chunk_listener.set(on_chunk)
+        try:
+            result = await asyncio.wait_for(self._send_limited(agent_name, task), self.tool_call_timeout)
+        finally:
+            _chunk_listener.reset(token)
+
+        if not isinstance(result, Task) or result.status.state != TaskState.completed:
+            raise RemoteAgentError(f"{agent_name} did not complete the task")
+        return task_text(result)
+
+    def list_pipelines(self) -> str:
+        return "[\n  " + ",\n  ".join(f"{pipeline.name}: {pipeline.description}" for pipeline in self.pipelines.values()) + "\n]"
+
+    def _instructions(self) -> str:
+        pipelines = ""
+        if self.pipelines:
+            pipelines = f"""
+
+                Available Pipelines: {self.list_pipelines()}
+
+                When a request matches a pipeline, call run_pipeline once instead of calling its agents one by one."""
+
+        return f"""
                 You are an expert Routing Delegator that helps users with requests.
 
                 Your role:
                 - Delegate user inquiries to appropriate specialized remote agents
                 - Provide clear and helpful responses to users
 
-                Available Agents: {self.list_remote_agents()}
+                Available Agents: {self.list_remote_agents()}{pipelines}
 
-                Always be helpful and route requests to the most appropriate agent.""",
+                Always be helpful and route requests to the most appropriate agent."""
+
+    async def create_agent(self):
+        # Create an Azure AI Agent instance
+        
+        try:
+            # Create Azure AI Agent with the send_message function, and run_pipeline when pipelines are declared
+            functions = FunctionTool({self.send_message, self.run_pipeline} if self.pipelines else {self.send_message})
+            self.azure_agent = await self.agents_client.create_agent(
+                model=os.environ["MODEL_DEPLOYMENT_NAME"],
+                name="routing-agent",
+                instructions=self._instructions(),
                 tools=functions.definitions
             )
 
-            # Create a thread for conversation
-            self.current_thread = self.agents_client.threads.create()
-
             return self.azure_agent
             
         except Exception as e:
             print(f"Error creating Azure AI agent: {e}")
             raise
 
-    async def process_user_message(self, user_message: str) -> str:
+    @tracing.traced("routing.request")
+    async def process_user_message(self, user_message: str, session_id: str = "default", bypass_cache: bool = False) -> str:
+
+        tracing.annotate(session_id=session_id)
+
+        # Both settings apply to this request only, including the tool calls it spawns
+        bypass_token = _bypass_cache.set(bypass_cache)
+        session_token = _session_context.set(session_id)
+        try:
+            return await self._process_user_message(user_message, session_id)
+        finally:
+            _session_context.reset(session_token)
+            _bypass_cache.reset(bypass_token)
+
+    async def _process_user_message(self, user_message: str, session_id: str) -> str:
 
         if not hasattr(self, 'azure_agent') or not self.azure_agent:
             return "Azure AI Agent not initialized. Please ensure the agent is properly created."
         
-        if not hasattr(self, 'current_thread') or not self.current_thread:
-            return "Azure AI Thread not initialized. Please ensure the agent is properly created."
-        
         try:
-            # Create message in the thread
-            self.agents_client.messages.create(
-                thread_id=self.current_thread.id, 
-                role=MessageRole.User, 
-                content=user_message
-            )
-
-            # Create and run the agent
-            run = self.agents_client.runs.create(
-                thread_id=self.current_thread.id, 
-                agent_id=self.azure_agent.id
-            )
-            
-            # Need to await send_message function
-            while run.status in ["queued", "in_progress", "requires_action"]:
-                time.sleep(1)
-                run = self.agents_client.runs.get(thread_id=self.current_thread.id, run_id=run.id)
-
-                if run.status == "requires_action":
-                    tool_calls = run.required_action.submit_tool_outputs.tool_calls
-                    tool_outputs = []
-                    
-                    for tool_call in tool_calls:
-                        function_name = tool_call.function.name
-                        function_args = json.loads(tool_call.function.arguments)
-                        
-                        if function_name == "send_message":
-                            try:
-                                result = await self.send_message(agent_name=function_args["agent_name"], task=function_args["task"])
-                                output = json.dumps(result.model_dump() if hasattr(result, 'model_dump') else str(result))
-
-                            except Exception as e:
-                                output = json.dumps({"error": str(e)})
-                        else:
-                            output = json.dumps({"error": f"Unknown function: {function_name}"})
-                        
-                        tool_outputs.append({"tool_call_id": tool_call.id,  "output": output})
-                
-                    # Submit the tool outputs
-                    self.agents_client.runs.submit_tool_outputs(
-                        thread_id=self.current_thread.id, run_id=run.id, tool_outputs=tool_outputs
+            # Each session has its own thread; turns within a session run one at a time
+            async with self.sessions.session(session_id) as session:
+
+                # Hand obvious single-agent requests straight to that agent
+                if self.fast_path is not None:
+                    response = await self._try_fast_path(user_message, session.thread_id)
+                    if response is not None:
+                        return response
+
+                # Create message in the thread
+                await self.agents_client.messages.create(
+                    thread_id=session.thread_id, 
+                    role=MessageRole.User, 
+                    content=user_message
+                )
+
+                # Create and drive the run; only the most recent messages are sent to the model
+                with tracing.span("routing.run", driver=type(self.run_driver).__name__):
+                    run = await self.run_driver.drive(
+                        self.agents_client,
+                        thread_id=session.thread_id,
+                        agent_id=self.azure_agent.id,
+                        handle_tool_calls=self._handle_tool_calls,
+                        on_event=self._on_run_event,
+                        truncation_strategy=self.truncation_strategy,
                     )
-
-            if run.status == "failed":
-                error_info = f"Run error: {run.last_error}"
-                print(error_info)
-                return f"Error processing request: {error_info}"
-
-            # Return the response
-            messages = self.agents_client.messages.list(thread_id=self.current_thread.id, order=ListSortOrder.DESCENDING)
-            for msg in messages:
-                if msg.role == MessageRole.AGENT and msg.text_messages:
-                    last_text = msg.text_messages[-1]
-                    return last_text.text.value
-            
-            return "No response received from agent."
+                    tracing.annotate(status=str(run.status))
+
+                if run.status == "failed":
+                    error_info = f"Run error: {run.last_error}"
+                    print(error_info)
+                    return f"Error processing request: {error_info}"
+
+                # Return the response
+                with tracing.span("routing.list_messages"):
+                    messages = self.agents_client.messages.list(thread_id=session.thread_id, order=ListSortOrder.DESCENDING)
+                    async for msg in messages:
+                        if msg.role == MessageRole.AGENT and msg.text_messages:
+                            last_text = msg.text_messages[-1]
+                            return last_text.text.value
+                
+                return "No response received from agent."
             
         except Exception as e:
             error_msg = f"Error in process_user_message: {e}"
             print(error_msg)
             return f"An error occurred while processing your message."
 
+    async def _try_fast_path(self, user_message: str, thread_id: str) -> str | None:
+        # Returns None whenever the router model should handle the message instead
+        decision = self.fast_path.classify(user_message)
+        if decision.agent_name is None or decision.agent_name not in self.remote_agent_connections:
+            return None
 
-async def _get_initialized_routing_agent_sync() -> RoutingAgent:
-
-    async def _async_main() -> RoutingAgent:
-        routing_agent_instance = await RoutingAgent.create(
-            remote_agent_addresses=[
-                f"http://{os.environ["SERVER_URL"]}:{os.environ["TITLE_AGENT_PORT"]}",
-                f"http://{os.environ["SERVER_URL"]}:{os.environ["OUTLINE_AGENT_PORT"]}",
-            ]
-        )
-        # Create the Azure AI agent
-        routing_agent_instance.create_agent()
-        return routing_agent_instance
-
-    try:
-        return asyncio.run(_async_main())
-    except RuntimeError as e:
-        raise
+        _emit({"type": "status", "agent": decision.agent_name, "state": "working",
+               "text": f"Routed directly (confidence {decision.confidence:.2f})."})
+        try:
+            task = await asyncio.wait_for(self._send_limited(decision.agent_name, user_message), self.tool_call_timeout)
+        except Exception as e:
+            print(f"Fast path to {decision.agent_name} failed, using the router model: {e}")
+            task = None
+
+        response = task_text(task) if isinstance(task, Task) and task.status.state == TaskState.completed else ""
+        if not response:
+            self.fast_path_fallbacks += 1
+            return None
+
+        # Keep the session thread's history the same as if the router model had answered
+        await self.agents_client.messages.create(thread_id=thread_id, role=MessageRole.User, content=user_message)
+        await self.agents_client.messages.create(thread_id=thread_id, role=MessageRole.AGENT, content=response)
+        self.fast_path_routes += 1
+        tracing.annotate(fast_path=decision.agent_name)
+        return response
+
+    async def process_user_message_stream(self, user_message: str, session_id: str = "default", bypass_cache: bool = False) -> AsyncIterator[dict[str, Any]]:
+        """Process a message and yield progress events as they happen.
+
+        Yields ``delta`` events with router tokens, ``status`` events with remote
+        agent task updates and a final ``done`` event with the full response.
+        """
+
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def _run() -> None:
+            # The sink is only visible to this task and the tool calls it spawns
+            _event_sink.set(events)
+            try:
+                response = await self.process_user_message(user_message, session_id=session_id, bypass_cache=bypass_cache)
+                events.put_nowait({"type": "done", "response": response})
+            except Exception as e:
+                events.put_nowait({"type": "done", "response": f"An error occurred while processing your message: {e}"})
+
+        task = asyncio.create_task(_run())
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event["type"] == "done":
+                    break
+        finally:
+            # Stop the run if the caller goes away before it finishes
+            if not task.done():
+                task.cancel()
+
+    def _on_run_event(self, event_type, event_data) -> None:
+        # Forward the router model's token deltas to a streaming caller
+        if event_type == AgentStreamEvent.THREAD_MESSAGE_DELTA:
+            text = getattr(event_data, "text", "")
+            if text:
+                _emit({"type": "delta", "text": text})
+
+    async def _handle_tool_calls(self, tool_calls: list) -> list[dict[str, str]]:
+        # Execute the tool calls requested by a run concurrently; gather keeps the original order
+        outputs = await asyncio.gather(*(self._execute_tool_call(tool_call) for tool_call in tool_calls))
+
+        return [
+            {"tool_call_id": tool_call.id, "output": output}
+            for tool_call, output in zip(tool_calls, outputs)
+        ]
+
+    async def _send_limited(self, agent_name: str, task: str):
+        # Limit how many calls go to the same remote agent at once; callers bound the wait with their timeout
+        limit = self._agent_call_limits.setdefault(agent_name, asyncio.Semaphore(self.max_calls_per_agent))
+        async with limit:
+            return await self.send_message(agent_name=agent_name, task=task)
+
+    async def _execute_tool_call(self, tool_call) -> str:
+        # Run a single tool call and always return a JSON output, even on failure or timeout
+        function_name = tool_call.function.name
+
+        if function_name not in ("send_message", "run_pipeline"):
+            return json.dumps({"error": f"Unknown function: {function_name}"})
 
-# Initialize the routing agent
-routing_agent = _get_initialized_routing_agent_sync()
+        try:
+            function_args = json.loads(tool_call.function.arguments)
+
+            # Each pipeline step is a delegation with its own timeout
+            if function_name == "run_pipeline":
+                agent_name = function_args["pipeline_name"]
+                with tracing.span("routing.tool_call", pipeline=agent_name):
+                    result = await self.run_pipeline(pipeline_name=agent_name, task=function_args["task"])
+                return self.tool_output.pipeline(result)
+
+            agent_name = function_args["agent_name"]
+
+            with tracing.span("routing.tool_call", agent=agent_name):
+                result = await asyncio.wait_for(
+                    self._send_limited(agent_name, function_args["task"]),
+                    timeout=self.tool_call_timeout,
+                )
+            return self.tool_output.task(agent_name, result)
+
+        except CircuitOpenError as e:
+            return json.dumps({"error": str(e), "agent": e.agent_name, "retry_after": round(e.retry_after)})
+        except asyncio.TimeoutError:
+            return json.dumps({"error": f"Call to {agent_name} timed out"})
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+
+    def fast_path_stats(self) -> dict[str, Any] | None:
+        if self.fast_path is None:
+            return None
+        return {"routes": self.fast_path_routes, "fallbacks": self.fast_path_fallbacks}
+
+    def health_stats(self) -> dict[str, dict[str, Any]]:
+        return {name: pool.stats() for name, pool in self.remote_agent_connections.items()}
+
+    async def close(self) -> None:
+        # Delete the session threads, then release the async Azure client and its credential
+        await self.discovery.close()
+        await self.sessions.close()
+        if self.result_cache is not None:
+            self.result_cache.close()
+        if self._owns_transport:
+            await self.transport.close()
+        await self.agents_client.close()
+        if self._credential is not None:
+            await self._credential.close()
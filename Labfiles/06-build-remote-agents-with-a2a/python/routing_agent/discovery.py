@@ -0,0 +1,139 @@
+""" Concurrent agent card discovery with an on-disk cache and background refresh """
+
+import asyncio
+import json
+import os
+
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+
+# Called with (address, card) whenever a card is discovered or changes
+CardChangedCallback = Callable[[str, AgentCard], Awaitable[None]]
+
+
+class AgentCardDiscovery:
+    """Resolves agent cards for a set of addresses.
+
+    All addresses are resolved concurrently, each bounded by ``timeout`` seconds,
+    so one slow agent cannot stall the others. Resolved cards are written to
+    ``cache_path`` and read back on the next start, letting the router come up
+    with the cached cards while fresh ones are fetched in the background.
+    """
+
+    def __init__(self, httpx_client: httpx.AsyncClient, cache_path: str | None = None,
+                 timeout: float = 5.0, refresh_interval: float = 60.0):
+        self.httpx_client = httpx_client
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.addresses: list[str] = []
+        self.cards: dict[str, AgentCard] = {}
+        self._refresh_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def load_cache(self) -> dict[str, AgentCard]:
+        """Read cached cards keyed by address; a missing or corrupt cache is ignored."""
+
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            return {address: AgentCard.model_validate(card) for address, card in data.items()}
+        except Exception as e:
+            print(f"WARNING: Ignoring agent card cache {self.cache_path}: {e}")
+            return {}
+
+    def save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        data = {address: card.model_dump(mode="json", by_alias=True, exclude_none=True) for address, card in self.cards.items()}
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    async def _resolve(self, address: str) -> AgentCard | None:
+        try:
+            resolver = A2ACardResolver(self.httpx_client, address)
+            return await asyncio.wait_for(resolver.get_agent_card(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            print(f"ERROR: Timed out after {self.timeout}s getting agent card from {address}")
+        except httpx.ConnectError as e:
+            print(f"ERROR: Failed to get agent card from {address}: {e}")
+        except Exception as e:
+            print(f"ERROR: Failed to resolve agent card for {address}: {e}")
+        return None
+
+    async def resolve(self, addresses: list[str], on_changed: CardChangedCallback) -> None:
+        """Resolve every address concurrently and report new or changed cards."""
+
+        for address in addresses:
+            if address not in self.addresses:
+                self.addresses.append(address)
+
+        results = await asyncio.gather(*(self._resolve(address) for address in addresses))
+
+        changed = False
+        for address, card in zip(addresses, results):
+            if card is None or self.cards.get(address) == card:
+                continue
+            self.cards[address] = card
+            changed = True
+            await on_changed(address, card)
+
+        if changed:
+            self.save_cache()
+
+    async def discover(self, addresses: list[str], on_changed: CardChangedCallback) -> None:
+        """Initial discovery: use cached cards right away and only wait on uncached addresses."""
+
+        self.addresses.extend(address for address in addresses if address not in self.addresses)
+
+        cached = self.load_cache()
+        for address in addresses:
+            if address in cached:
+                self.cards[address] = cached[address]
+                await on_changed(address, cached[address])
+
+        uncached = [address for address in addresses if address not in cached]
+        if uncached:
+            await self.resolve(uncached, on_changed)
+
+        # Cached cards may be stale, so confirm them off the startup path
+        stale = [address for address in addresses if address in cached]
+        if stale:
+            task = asyncio.get_running_loop().create_task(self.resolve(stale, on_changed))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    def start_refresh(self, on_changed: CardChangedCallback) -> None:
+        """Periodically re-resolve all known addresses to pick up new or changed agents."""
+
+        if self.refresh_interval <= 0 or self._refresh_task is not None:
+            return
+
+        async def _refresh_loop():
+            while True:
+                await asyncio.sleep(self.refresh_interval)
+                try:
+                    await self.resolve(list(self.addresses), on_changed)
+                except Exception as e:
+                    print(f"ERROR: Agent card refresh failed: {e}")
+
+        self._refresh_task = asyncio.get_running_loop().create_task(_refresh_loop())
+
+    async def close(self) -> None:
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
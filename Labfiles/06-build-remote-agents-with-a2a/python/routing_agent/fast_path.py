@@ -0,0 +1,102 @@
+""" Local routing fast path built from the remote agents' cards """
+
+import math
+import re
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from a2a.types import AgentCard
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+a an and are as at be but by can could do for from give have i in is it its me my of on or please
+some that the this to up we with would you your about into our us an any get make need want write
+help
+""".split())
+
+# Skill fields carry different amounts of routing signal
+_FIELD_WEIGHTS = {"name": 1.0, "description": 1.0, "skill_name": 2.0, "skill_description": 2.0, "tags": 3.0, "examples": 1.5}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens without stopwords, with a light plural strip."""
+
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+@dataclass
+class RouteDecision:
+    agent_name: str | None
+    confidence: float
+    scores: dict[str, float]
+
+
+class SkillIndex:
+    """TF-IDF index with one weighted document per agent card.
+
+    A message is routed to the best-scoring agent only when its cosine
+    similarity reaches ``threshold`` and beats the runner-up by ``margin``;
+    anything less confident (including messages that match several agents)
+    is left to the router model.
+    """
+
+    def __init__(self, threshold: float = 0.3, margin: float = 0.2):
+        self.threshold = threshold
+        self.margin = margin
+        self._vectors: dict[str, dict[str, float]] = {}
+        self._idf: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def build(self, cards: Iterable[AgentCard]) -> None:
+        documents: dict[str, Counter] = {}
+        for card in cards:
+            terms: Counter = Counter()
+            fields = [("name", card.name), ("description", card.description)]
+            for skill in card.skills:
+                fields += [("skill_name", skill.name), ("skill_description", skill.description)]
+                fields += [("tags", tag) for tag in skill.tags]
+                fields += [("examples", example) for example in skill.examples or []]
+            for field, text in fields:
+                for token in tokenize(text):
+                    terms[token] += _FIELD_WEIGHTS[field]
+            documents[card.name] = terms
+
+        # Terms every agent shares (like "agent" or "generate") carry no routing signal
+        count = len(documents)
+        document_frequency = Counter(token for terms in documents.values() for token in terms)
+        self._idf = {token: math.log((1 + count) / (1 + df)) + 1 for token, df in document_frequency.items()}
+        if count > 1:
+            self._idf = {token: idf for token, idf in self._idf.items() if document_frequency[token] < count}
+        self._vectors = {name: self._normalize({t: w * self._idf[t] for t, w in terms.items() if t in self._idf})
+                         for name, terms in documents.items()}
+
+    @staticmethod
+    def _normalize(vector: dict[str, float]) -> dict[str, float]:
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        return {token: value / norm for token, value in vector.items()} if norm else {}
+
+    def classify(self, message: str) -> RouteDecision:
+        query = self._normalize({token: count * self._idf[token]
+                                 for token, count in Counter(tokenize(message)).items() if token in self._idf})
+        scores = {name: sum(weight * vector.get(token, 0.0) for token, weight in query.items())
+                  for name, vector in self._vectors.items()}
+        if not scores:
+            return RouteDecision(None, 0.0, scores)
+
+        ranked = sorted(scores.values(), reverse=True)
+        best = max(scores, key=scores.get)
+        runner_up = ranked[1] if len(ranked) > 1 else 0.0
+        confident = ranked[0] >= self.threshold and ranked[0] - runner_up >= self.margin
+        return RouteDecision(best if confident else None, ranked[0], scores)
@@ -0,0 +1,164 @@
+""" Declarative multi-step delegation: one remote agent's answer feeds the next without a router model turn """
+
+import asyncio
+import json
+import os
+import re
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_PIPELINES_PATH = Path(__file__).resolve().parents[1] / "pipelines.json"
+
+STEP_INPUTS = ("text", "first_line")
+
+# Receives each chunk of a remote agent's answer as it streams in, and whether it is the last one
+ChunkCallback = Callable[[str, bool], None]
+
+# A list marker or heading mark: "-", "*", "#", "1." or "1)" followed by whitespace
+_LINE_MARKER = re.compile(r"^\s*(?:[-*#]+|\d+[.)])\s+")
+
+# Sends a task to a named remote agent and returns the text of its completed answer
+Delegate = Callable[[str, str, ChunkCallback | None], Awaitable[str]]
+
+
+@dataclass
+class PipelineStep:
+    """One delegation. ``task`` may use {input} (the user's request) and {previous} (the prior step's answer).
+
+    ``use`` picks what {previous} receives: the whole answer (``text``) or its
+    first non-empty line (``first_line``). A ``speculative`` step that uses the
+    first line starts as soon as that line has streamed in (at a line break, or
+    at the last chunk of a one-line answer), and its result is kept only if the
+    finished answer starts with the same line.
+    """
+
+    agent: str
+    task: str = "{input}"
+    use: str = "text"
+    speculative: bool = False
+
+    def render(self, user_input: str, previous: str) -> str:
+        # Plain replacement so braces in the template or the answers need no escaping
+        return self.task.replace("{input}", user_input).replace("{previous}", previous)
+
+    def previous_input(self, text: str) -> str:
+        return first_line(text) if self.use == "first_line" else text
+
+
+@dataclass
+class Pipeline:
+    name: str
+    description: str
+    steps: list[PipelineStep] = field(default_factory=list)
+
+
+def first_line(text: str) -> str:
+    """The first non-empty line without a list marker or heading mark, and without surrounding quotes or bold."""
+
+    for line in text.splitlines():
+        line = _LINE_MARKER.sub("", line, count=1).strip().strip('"*\u201c\u201d').strip()
+        if line:
+            return line
+    return ""
+
+
+def load_pipelines(path: str | Path | None = None) -> dict[str, Pipeline]:
+    """Load pipelines from ROUTING_PIPELINES (or pipelines.json); an empty setting disables them."""
+
+    path = os.getenv("ROUTING_PIPELINES", str(DEFAULT_PIPELINES_PATH)) if path is None else path
+    if not path or not Path(path).exists():
+        return {}
+
+    pipelines = {}
+    for raw in json.loads(Path(path).read_text()):
+        steps = [PipelineStep(**step) for step in raw["steps"]]
+        for step in steps:
+            if step.use not in STEP_INPUTS:
+                raise ValueError(f"Pipeline {raw['name']}: unknown step input '{step.use}'. Choose from: {', '.join(STEP_INPUTS)}")
+        pipelines[raw["name"]] = Pipeline(name=raw["name"], description=raw["description"], steps=steps)
+    return pipelines
+
+
+class PipelineRunner:
+    """Runs pipelines step by step through ``delegate``, starting speculative steps early."""
+
+    def __init__(self, delegate: Delegate, on_status: Callable[[str, str], None] | None = None):
+        self._delegate = delegate
+        self._on_status = on_status or (lambda agent, text: None)
+        self.runs = 0
+        self.speculative_hits = 0
+        self.speculative_misses = 0
+
+    async def run(self, pipeline: Pipeline, user_input: str) -> list[dict[str, Any]]:
+        self.runs += 1
+        results: list[dict[str, Any]] = []
+        previous = ""
+        speculation: tuple[str, asyncio.Task] | None = None
+
+        try:
+            for index, step in enumerate(pipeline.steps):
+                task = step.render(user_input, step.previous_input(previous) if index else "")
+                next_step = pipeline.steps[index + 1] if index + 1 < len(pipeline.steps) else None
+
+                outcome = None
+                if speculation is not None:
+                    guess, speculative_task = speculation
+                    speculation = None
+                    if guess == task:
+                        outcome = "hit"
+                        self.speculative_hits += 1
+                    else:
+                        outcome = "miss"
+                        self.speculative_misses += 1
+                        speculative_task.cancel()
+
+                if outcome == "hit":
+                    output = await speculative_task
+                else:
+                    on_chunk = None
+                    if next_step is not None and next_step.speculative and next_step.use == "first_line":
+                        on_chunk, get_speculation = self._speculate(next_step, user_input)
+                    try:
+                        output = await self._delegate(step.agent, task, on_chunk)
+                    finally:
+                        if on_chunk is not None:
+                            speculation = get_speculation()
+
+                results.append({"agent": step.agent, "task": task, "output": output, "speculative": outcome})
+                previous = output
+        finally:
+            # Drop a speculative step the run will not use
+            if speculation is not None:
+                speculation[1].cancel()
+        return results
+
+    def _speculate(self, step: PipelineStep, user_input: str):
+        # Watch the upstream answer stream and start ``step`` once its first line is complete
+        buffer: list[str] = []
+        started: list[tuple[str, asyncio.Task]] = []
+
+        def on_chunk(text: str, last: bool) -> None:
+            if started:
+                return
+            buffer.append(text)
+            streamed = "".join(buffer)
+            # One-line answers, such as a single title, complete their first line with the last chunk
+            if "\n" not in streamed.lstrip() and not last:
+                return
+            line = first_line(streamed)
+            if not line:
+                return
+            task = step.render(user_input, line)
+            self._on_status(step.agent, "Started early from a partial answer.")
+            speculative_task = asyncio.ensure_future(self._delegate(step.agent, task, None))
+            # A discarded speculation's failure is not an error of the run
+            speculative_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            started.append((task, speculative_task))
+
+        return on_chunk, lambda: started[0] if started else None
+
+    def stats(self) -> dict[str, int]:
+        return {"runs": self.runs, "speculative_hits": self.speculative_hits, "speculative_misses": self.speculative_misses}
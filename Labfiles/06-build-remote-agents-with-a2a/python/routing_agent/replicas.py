@@ -0,0 +1,173 @@
+""" Load-aware selection across replicas of one remote agent """
+
+import asyncio
+import random
+import uuid
+
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+
+from a2a.types import AgentCard, SendMessageRequest, SendMessageResponse, SendStreamingMessageRequest, SendStreamingMessageResponse
+from routing_agent.resilience import CircuitOpenError, EndpointHealth
+
+SELECTION_POLICIES = ("least_outstanding", "ewma")
+
+
+def with_new_ids(message_request):
+    # A hedged or retried attempt is a separate request and message as far as the remote agent is concerned
+    request = message_request.model_copy(deep=True)
+    request.id = str(uuid.uuid4())
+    request.params.message.message_id = str(uuid.uuid4())
+    return request
+
+
+class Replica(Protocol):
+    card: AgentCard
+    url: str
+    health: EndpointHealth
+
+    async def send_message(self, message_request: SendMessageRequest, idempotent: bool = False) -> SendMessageResponse: ...
+
+    def send_message_streaming(self, message_request: SendStreamingMessageRequest) -> AsyncIterator[SendStreamingMessageResponse]: ...
+
+
+class ReplicaPool:
+    """All endpoints serving the same agent card name.
+
+    Each call goes to one replica chosen by ``policy``:
+
+    - ``least_outstanding``: fewest requests in flight, ties broken at random;
+    - ``ewma``: lowest smoothed latency weighted by requests in flight.
+
+    Replicas whose circuit is open are ejected from selection until their
+    circuit lets a trial through. When every replica is ejected the call
+    fails fast with the ``CircuitOpenError`` of the replica that recovers first.
+    Idempotent calls that fail are retried once on another replica; streams
+    are retried or hedged only until their first event arrives.
+    """
+
+    def __init__(self, name: str, policy: str = "least_outstanding"):
+        if policy not in SELECTION_POLICIES:
+            raise ValueError(f"Unknown replica policy {policy}. Choose from: {', '.join(SELECTION_POLICIES)}")
+        self.name = name
+        self.policy = policy
+        self.replicas: dict[str, Replica] = {}
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    @property
+    def card(self) -> AgentCard:
+        # The most recently registered replica's card describes the agent
+        return next(reversed(self.replicas.values())).card
+
+    def add(self, replica: Replica) -> None:
+        self.replicas.pop(replica.url, None)
+        self.replicas[replica.url] = replica
+
+    def remove(self, url: str) -> Replica | None:
+        return self.replicas.pop(url, None)
+
+    def get(self, url: str) -> Replica | None:
+        return self.replicas.get(url)
+
+    def select(self, exclude: Replica | None = None) -> Replica:
+        candidates = [replica for replica in self.replicas.values() if replica.health.available and replica is not exclude]
+        if not candidates:
+            # Nothing to send to; report when the first replica recovers without touching any breaker
+            retry_after = min((replica.health.retry_after() for replica in self.replicas.values()), default=0.0)
+            raise CircuitOpenError(self.name, retry_after)
+
+        if self.policy == "ewma":
+            # Unmeasured replicas are assumed as fast as the fastest one so they get traffic
+            known = [replica.health.ewma for replica in candidates if replica.health.ewma is not None]
+            default = min(known) if known else 1.0
+            return min(candidates, key=lambda replica: (replica.health.ewma or default) * (replica.health.outstanding + 1))
+        fewest = min(replica.health.outstanding for replica in candidates)
+        return random.choice([replica for replica in candidates if replica.health.outstanding == fewest])
+
+    async def send_message(self, message_request: SendMessageRequest, idempotent: bool = False) -> SendMessageResponse:
+        replica = self.select()
+        try:
+            return await replica.send_message(message_request, idempotent=idempotent)
+        except CircuitOpenError:
+            raise
+        except Exception as error:
+            # An idempotent request that failed on one replica is retried once on another
+            if not idempotent:
+                raise
+            try:
+                retry = self.select(exclude=replica)
+            except CircuitOpenError:
+                raise error
+            return await retry.send_message(message_request, idempotent=idempotent)
+
+    async def send_message_streaming(self, message_request: SendStreamingMessageRequest,
+                                     idempotent: bool = False) -> AsyncIterator[SendStreamingMessageResponse]:
+        # Retries and hedges apply until the first event arrives; after that the stream stays on its replica
+        replica = self.select()
+        attempts: dict[asyncio.Future, AsyncIterator[SendStreamingMessageResponse]] = {}
+
+        def start(target: Replica, request: SendStreamingMessageRequest) -> None:
+            stream = target.send_message_streaming(request)
+            attempts[asyncio.ensure_future(_first_event(stream))] = stream
+
+        start(replica, message_request)
+        winner = None
+        try:
+            # Like EndpointHealth.call, hedge a slow first event or retry a stream that failed before it
+            hedge_delay = replica.health.hedge_delay() if idempotent else None
+            done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+            first = next(iter(done), None)
+            retry = idempotent and (first is None or (first.exception() is not None
+                                                      and not isinstance(first.exception(), CircuitOpenError)))
+            if retry:
+                try:
+                    target = self.select(exclude=replica)
+                except CircuitOpenError:
+                    # A single replica is hedged against itself, but a failed stream is not retried there
+                    target = replica if hedge_delay is not None else None
+                if target is not None:
+                    if hedge_delay is not None:
+                        replica.health.hedges += 1
+                    start(target, with_new_ids(message_request))
+
+            # Keep the first stream that produced an event; fail only when every attempt failed
+            pending = set(attempts)
+            error = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        winner = attempt
+                        break
+                    error = attempt.exception()
+            if winner is None:
+                raise error
+        finally:
+            losers = [attempt for attempt in attempts if attempt is not winner]
+            for attempt in losers:
+                attempt.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+            for attempt in losers:
+                await attempts[attempt].aclose()
+
+        stream = attempts[winner]
+        has_event, response = winner.result()
+        try:
+            if has_event:
+                yield response
+                async for response in stream:
+                    yield response
+        finally:
+            await stream.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {url: replica.health.stats() for url, replica in self.replicas.items()}
+
+
+async def _first_event(stream: AsyncIterator[SendStreamingMessageResponse]) -> tuple[bool, SendStreamingMessageResponse | None]:
+    try:
+        return True, await anext(stream)
+    except StopAsyncIteration:
+        return False, None
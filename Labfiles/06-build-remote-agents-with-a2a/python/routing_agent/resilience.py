@@ -0,0 +1,203 @@
+""" Circuit breaking, adaptive timeouts and hedging for remote agent calls """
+
+import asyncio
+import os
+import time
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the agent while its circuit is open."""
+
+    def __init__(self, agent_name: str, retry_after: float):
+        super().__init__(f"{agent_name} is unavailable; retry in {retry_after:.0f}s")
+        self.agent_name = agent_name
+        self.retry_after = retry_after
+
+
+@dataclass
+class ResiliencePolicy:
+    """Settings shared by every remote agent endpoint."""
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    min_timeout: float = 5.0
+    max_timeout: float = 30.0
+    timeout_multiplier: float = 2.0
+    hedge: bool = True
+    hedge_percentile: float = 95.0
+    min_samples: int = 20
+    window: int = 200
+    ewma_alpha: float = 0.3
+
+    @classmethod
+    def from_env(cls) -> 'ResiliencePolicy':
+        return cls(
+            failure_threshold=int(os.getenv("ROUTING_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("ROUTING_BREAKER_RESET", "30")),
+            min_timeout=float(os.getenv("ROUTING_MIN_TIMEOUT", "5")),
+            max_timeout=float(os.getenv("A2A_HTTP_TIMEOUT", "30")),
+            timeout_multiplier=float(os.getenv("ROUTING_TIMEOUT_MULTIPLIER", "2")),
+            hedge=os.getenv("ROUTING_HEDGE", "1") != "0",
+        )
+
+
+class EndpointHealth:
+    """Latency history and circuit state for one remote agent endpoint.
+
+    The circuit opens after ``failure_threshold`` consecutive failures and
+    rejects calls until ``reset_timeout`` has passed. Then a single trial
+    call is let through: success closes the circuit, failure re-opens it.
+    Timeouts follow the observed p99 latency times ``timeout_multiplier``,
+    clamped to [min_timeout, max_timeout].
+    """
+
+    def __init__(self, name: str, policy: ResiliencePolicy):
+        self.name = name
+        self.policy = policy
+        self.latencies: deque[float] = deque(maxlen=policy.window)
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.hedges = 0
+
+        # Load signals used to pick between replicas
+        self.outstanding = 0
+        self.ewma: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.policy.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        # Seconds until the circuit lets a trial through; 0 once it is half-open or closed
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.policy.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    @property
+    def available(self) -> bool:
+        # An open circuit ejects the endpoint; a half-open one takes a single trial
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._trial_in_flight)
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        alpha = self.policy.ewma_alpha
+        self.ewma = latency if self.ewma is None else alpha * latency + (1 - alpha) * self.ewma
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self._trial_in_flight or self.consecutive_failures >= self.policy.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        # A cancelled call says nothing about the agent; let the next one be the trial
+        self._trial_in_flight = False
+
+    def percentile(self, pct: float) -> float | None:
+        if len(self.latencies) < self.policy.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def timeout(self) -> float:
+        p99 = self.percentile(99)
+        if p99 is None:
+            return self.policy.max_timeout
+        return min(self.policy.max_timeout, max(self.policy.min_timeout, p99 * self.policy.timeout_multiplier))
+
+    def hedge_delay(self) -> float | None:
+        return self.percentile(self.policy.hedge_percentile) if self.policy.hedge else None
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], idempotent: bool = False) -> Any:
+        """Run ``fn`` under the circuit and the adaptive timeout.
+
+        For idempotent calls a second attempt is started once the first has
+        taken longer than the hedge percentile (or failed sooner); whichever
+        succeeds first wins.
+        """
+
+        self.before_call()
+        timeout = self.timeout()
+        hedge_delay = self.hedge_delay() if idempotent else None
+        start = time.monotonic()
+        self.outstanding += 1
+        try:
+            if hedge_delay is None:
+                result = await asyncio.wait_for(fn(), timeout)
+            else:
+                result = await asyncio.wait_for(self._hedged(fn, hedge_delay), timeout)
+        except asyncio.CancelledError:
+            self.release_trial()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        finally:
+            self.outstanding -= 1
+        self.record_success(time.monotonic() - start)
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[Any]], hedge_delay: float) -> Any:
+        attempts = [asyncio.ensure_future(fn())]
+        try:
+            # Hedge a slow first attempt, or retry one that failed before the hedge delay
+            done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+            if not done or attempts[0].exception() is not None:
+                self.hedges += 1
+                attempts.append(asyncio.ensure_future(fn()))
+
+            # Return the first success; fail only when every attempt failed
+            pending = set(attempts)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        p50, p99 = self.percentile(50), self.percentile(99)
+        return {
+            "state": self.state,
+            "outstanding": self.outstanding,
+            "ewma_ms": round(self.ewma * 1000, 1) if self.ewma is not None else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "hedges": self.hedges,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            "timeout_s": round(self.timeout(), 2),
+        }
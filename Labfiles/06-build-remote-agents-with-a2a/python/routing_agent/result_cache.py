@@ -0,0 +1,126 @@
+""" Cache of completed remote agent delegations """
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+
+from a2a.types import AgentCard, Task, TaskState
+
+
+def normalize_task(task: str) -> str:
+    """Collapse case and whitespace so trivially different phrasings share an entry."""
+    return " ".join(task.split()).casefold()
+
+
+class DelegationResultCache:
+    """LRU + TTL cache of completed Tasks keyed on (agent card, context, normalized task).
+
+    The card's name and version are part of the key, so publishing a new card
+    version starts a fresh set of entries. So is the A2A context id the task
+    was sent with, since the agent answers from that context's conversation. With ``path`` set, entries are also
+    written to a SQLite file and read back on a memory miss, so they survive
+    restarts. Only completed tasks are cached.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 600.0, path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Task]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self._puts_since_prune = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            with self._conn:
+                self._prune()
+
+    @staticmethod
+    def key(card: AgentCard, task: str, context_id: str | None = None) -> str:
+        # A delegation sent with a context id is answered from that context's conversation
+        raw = f"{card.name}\0{card.version}\0{context_id or ''}\0{normalize_task(task)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Task | None:
+        entry = self._entries.get(key)
+        if entry and time.time() - entry[0] <= self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry:
+            del self._entries[key]
+
+        if self._conn is not None:
+            row = await asyncio.to_thread(self._load, key)
+            if row:
+                stored_at, task = row[0], Task.model_validate_json(row[1])
+                self._remember(key, stored_at, task)
+                self.hits += 1
+                self.disk_hits += 1
+                return task
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, task: Task) -> None:
+        if task.status.state != TaskState.completed:
+            return
+        stored_at = time.time()
+        self._remember(key, stored_at, task)
+        if self._conn is not None:
+            await asyncio.to_thread(self._store, key, stored_at, task.model_dump_json(by_alias=True))
+
+    def _prune(self) -> None:
+        # Called with the lock held; keeps the file from growing past the live entries
+        self._conn.execute("DELETE FROM results WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+        self._puts_since_prune = 0
+
+    def _remember(self, key: str, stored_at: float, task: Task) -> None:
+        self._entries[key] = (stored_at, task)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key: str) -> tuple[float, str] | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT stored_at, data FROM results WHERE key = ? AND stored_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+
+    def _store(self, key: str, stored_at: float, data: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO results (key, stored_at, data) VALUES (?, ?, ?)", (key, stored_at, data))
+            self._puts_since_prune += 1
+            if self._puts_since_prune >= self.max_entries:
+                self._prune()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
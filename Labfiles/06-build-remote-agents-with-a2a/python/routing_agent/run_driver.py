@@ -0,0 +1,139 @@
+""" Async run drivers that take a routing agent run from creation to a terminal state """
+
+import asyncio
+import tracing
+
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from azure.ai.agents.models import AgentStreamEvent
+
+# Statuses in which a run still needs to be driven
+ACTIVE_RUN_STATUSES = ("queued", "in_progress", "requires_action", "cancelling")
+
+# Receives the tool calls of a requires_action run and returns the tool outputs to submit
+ToolCallHandler = Callable[[list[Any]], Awaitable[list[dict[str, str]]]]
+
+# Receives every (event_type, event_data) pair a streaming driver observes
+RunEventCallback = Callable[[Any, Any], None]
+
+
+class RunDriver(ABC):
+    """Drives an agent run on a thread until it completes, fails or is cancelled."""
+
+    @abstractmethod
+    async def drive(self, agents_client, thread_id: str, agent_id: str, handle_tool_calls: ToolCallHandler,
+                    on_event: RunEventCallback | None = None, **run_options):
+        """Start a run and return the run in its final state.
+
+        ``on_event`` sees raw run events when the driver streams them, such as message
+        deltas. ``run_options`` are passed through when the run is created, e.g.
+        ``truncation_strategy``.
+        """
+
+
+class PollingRunDriver(RunDriver):
+    """Polls the run status with adaptive exponential backoff.
+
+    The delay resets to ``initial_delay`` whenever the run changes state and grows by
+    ``multiplier`` (up to ``max_delay``) while it stays in the same state, so short
+    runs are picked up quickly without hammering the service during long ones.
+    """
+
+    def __init__(self, initial_delay: float = 0.1, max_delay: float = 2.0, multiplier: float = 2.0):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    async def drive(self, agents_client, thread_id: str, agent_id: str, handle_tool_calls: ToolCallHandler,
+                    on_event: RunEventCallback | None = None, **run_options):
+        run = await agents_client.runs.create(thread_id=thread_id, agent_id=agent_id, **run_options)
+        return await self.follow(agents_client, thread_id, run, handle_tool_calls)
+
+    async def follow(self, agents_client, thread_id: str, run, handle_tool_calls: ToolCallHandler):
+        """Poll an existing run, submitting tool outputs when asked, until it reaches a terminal state."""
+
+        delay = self.initial_delay
+        polls = 0
+
+        while run.status in ACTIVE_RUN_STATUSES:
+            if run.status == "requires_action":
+                tool_outputs = await handle_tool_calls(run.required_action.submit_tool_outputs.tool_calls)
+                run = await agents_client.runs.submit_tool_outputs(
+                    thread_id=thread_id, run_id=run.id, tool_outputs=tool_outputs
+                )
+                delay = self.initial_delay
+                continue
+
+            # Yield to the event loop instead of blocking it while the run is busy
+            await asyncio.sleep(delay)
+            previous_status = run.status
+            run = await agents_client.runs.get(thread_id=thread_id, run_id=run.id)
+            polls += 1
+
+            if run.status == previous_status:
+                delay = min(delay * self.multiplier, self.max_delay)
+            else:
+                delay = self.initial_delay
+
+        tracing.annotate(polls=polls)
+        return run
+
+
+class StreamingRunDriver(RunDriver):
+    """Follows the server-sent run events instead of polling.
+
+    Tool outputs are submitted on the same event stream, so a run is observed
+    from creation to completion over a single chained response. If the stream
+    closes before a terminal event, the run is followed by ``fallback`` polling.
+    """
+
+    def __init__(self, fallback: PollingRunDriver | None = None):
+        self.fallback = fallback or PollingRunDriver()
+
+    async def drive(self, agents_client, thread_id: str, agent_id: str, handle_tool_calls: ToolCallHandler,
+                    on_event: RunEventCallback | None = None, **run_options):
+        run = None
+
+        async with await agents_client.runs.stream(thread_id=thread_id, agent_id=agent_id, **run_options) as stream:
+            async for event_type, event_data, _ in stream:
+                if on_event is not None:
+                    on_event(event_type, event_data)
+
+                if not _is_run_event(event_type):
+                    continue
+
+                run = event_data
+                if event_type == AgentStreamEvent.THREAD_RUN_REQUIRES_ACTION:
+                    tool_outputs = await handle_tool_calls(run.required_action.submit_tool_outputs.tool_calls)
+                    await agents_client.runs.submit_tool_outputs_stream(
+                        thread_id=thread_id, run_id=run.id, tool_outputs=tool_outputs, event_handler=stream
+                    )
+
+        if run is None:
+            raise RuntimeError("Run stream ended before the run was created")
+
+        # The stream can close before the terminal event arrives; poll until the run really ends
+        if run.status in ACTIVE_RUN_STATUSES:
+            run = await agents_client.runs.get(thread_id=thread_id, run_id=run.id)
+            if run.status in ACTIVE_RUN_STATUSES:
+                tracing.annotate(stream_closed_early=True)
+                run = await self.fallback.follow(agents_client, thread_id, run, handle_tool_calls)
+
+        return run
+
+
+def _is_run_event(event_type) -> bool:
+    name = getattr(event_type, "value", event_type)
+    return name.startswith("thread.run.") and not name.startswith("thread.run.step.")
+
+
+def create_run_driver(mode: str = "stream") -> RunDriver:
+    """Create a run driver by name: ``stream`` or ``poll``."""
+
+    if mode == "stream":
+        return StreamingRunDriver()
+    if mode == "poll":
+        return PollingRunDriver()
+    raise ValueError(f"Unknown run driver '{mode}'. Choose from: stream, poll")
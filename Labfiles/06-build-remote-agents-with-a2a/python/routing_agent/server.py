@@ -1,25 +1,69 @@
 import os
-import asyncio
+import json
+import math
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sse_starlette.sse import EventSourceResponse
+from starlette.background import BackgroundTask
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
+from routing_agent.admission import AdmissionController, OverloadedError
 from routing_agent.agent import RoutingAgent  
+from routing_agent.transport import AgentTransportPool
 
 load_dotenv()
 
 routing_agent = None
+transport = None
+
+# Bounds concurrent routed requests; excess requests queue briefly or get a 429
+admission = AdmissionController.from_env()
+
+
+def _overloaded(error: OverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"error": str(error), "reason": error.reason},
+        headers={"Retry-After": str(math.ceil(error.retry_after))},
+    )
+
+
+def _request_timeout(data: dict) -> float | None:
+    # Callers may give a per-request deadline in seconds; anything else is a bad request
+    timeout = data.get("timeout")
+    if timeout is None:
+        return None
+    try:
+        seconds = float(timeout) if not isinstance(timeout, bool) else math.nan
+    except (TypeError, ValueError):
+        seconds = math.nan
+    if not math.isfinite(seconds) or seconds < 0:
+        raise ValueError(f"timeout must be a non-negative number of seconds, got {timeout!r}")
+    return seconds
+
+
+def _bad_request(error: ValueError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"error": str(error)})
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global routing_agent
+    global routing_agent, transport
     print("Starting up: Initializing routing agent...")
+
+    # The A2A connection pool lives exactly as long as the app
+    transport = AgentTransportPool.from_env()
+    # Extra addresses (comma separated) add agents, or replicas of the same agent card
+    extra_addresses = [address.strip() for address in os.getenv("A2A_REMOTE_AGENTS", "").split(",") if address.strip()]
     routing_agent = await RoutingAgent.create([
-        f"http://{os.environ["SERVER_URL"]}:{os.environ["TITLE_AGENT_PORT"]}",
-        f"http://{os.environ["SERVER_URL"]}:{os.environ["OUTLINE_AGENT_PORT"]}",
-    ])
-    routing_agent.create_agent()
+        f"http://{os.environ['SERVER_URL']}:{os.environ['TITLE_AGENT_PORT']}",
+        f"http://{os.environ['SERVER_URL']}:{os.environ['OUTLINE_AGENT_PORT']}",
+        *extra_addresses,
+    ], transport=transport)
+    await routing_agent.create_agent()
     print("Routing agent initialized.")
     yield
+    await routing_agent.close()
+    await transport.close()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -29,22 +73,84 @@ async def handle_message(request: Request):
 
     data = await request.json()
     user_message = data.get("message")
+    session_id = data.get("session_id") or "default"
+    no_cache = bool(data.get("no_cache"))
 
     if not user_message:
         return {"error": "No message provided."}
-    
+
+    try:
+        timeout = _request_timeout(data)
+    except ValueError as e:
+        return _bad_request(e)
+
+    try:
+        slot = await admission.acquire(timeout)
+    except OverloadedError as e:
+        return _overloaded(e)
+
     try:
-        response = await routing_agent.process_user_message(user_message)
+        response = await routing_agent.process_user_message(user_message, session_id=session_id, bypass_cache=no_cache)
 
     except Exception as e:
         return {"error": f"Failed to process message: {str(e)}"}
+
+    finally:
+        slot.release()
     
     return {"response": response}
 
+@app.post("/message/stream")
+async def handle_message_stream(request: Request):
+    # Stream router tokens and remote agent status updates as server-sent events
+
+    data = await request.json()
+    user_message = data.get("message")
+    session_id = data.get("session_id") or "default"
+    no_cache = bool(data.get("no_cache"))
+
+    if not user_message:
+        return {"error": "No message provided."}
+
+    # Admit before streaming starts so an overloaded server can still answer 429
+    try:
+        timeout = _request_timeout(data)
+    except ValueError as e:
+        return _bad_request(e)
+
+    try:
+        slot = await admission.acquire(timeout)
+    except OverloadedError as e:
+        return _overloaded(e)
+
+    async def event_stream():
+        try:
+            async for event in routing_agent.process_user_message_stream(user_message, session_id=session_id, bypass_cache=no_cache):
+                yield {"event": event["type"], "data": json.dumps(event)}
+        finally:
+            slot.release()
+
+    # The background task frees the slot if the client leaves before the stream starts
+    return EventSourceResponse(event_stream(), background=BackgroundTask(slot.release))
+
 @app.get("/health")
 async def health_check():
     return {"status": "Routing agent is running!"}
 
+@app.get("/stats")
+async def stats():
+    result_cache = routing_agent.result_cache
+    return {
+        "transport": transport.stats(),
+        "result_cache": result_cache.stats() if result_cache else None,
+        "single_flight": routing_agent.single_flight.stats(),
+        "remote_agents": routing_agent.health_stats(),
+        "fast_path": routing_agent.fast_path_stats(),
+        "pipelines": routing_agent.pipeline_runner.stats(),
+        "tool_output": routing_agent.tool_output.stats(),
+        "admission": admission.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv["ROUTING_AGENT_PORT"])
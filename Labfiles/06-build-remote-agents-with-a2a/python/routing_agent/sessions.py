@@ -0,0 +1,142 @@
+""" Session-keyed conversation threads for the routing agent """
+
+import asyncio
+import time
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SessionThread:
+    """The Foundry thread that holds one user session's conversation."""
+
+    session_id: str
+    thread_id: str
+    last_used: float = field(default_factory=time.monotonic)
+    turns: int = 0
+    # Turns holding or waiting for the session; it is never evicted while any do
+    users: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionThreadManager:
+    """Maps session ids to Foundry threads with LRU/TTL eviction.
+
+    At most ``max_threads`` threads are kept alive; the least recently used idle
+    session is evicted first, and sessions idle for longer than ``ttl_seconds``
+    are dropped. After ``max_turns`` turns a session starts over on a fresh
+    thread, so server-side history cannot grow without bound. Requests in the
+    same session are serialized because a thread can only have one active run.
+    """
+
+    def __init__(self, agents_client, max_threads: int = 256, ttl_seconds: float = 1800.0, max_turns: int = 50):
+        self.agents_client = agents_client
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self._sessions: OrderedDict[str, SessionThread] = OrderedDict()
+        # Thread creations in progress, so concurrent first turns of one session share a thread
+        self._creating: dict[str, asyncio.Task] = {}
+        self._cleanup_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @asynccontextmanager
+    async def session(self, session_id: str):
+        """Hold the session's thread for the duration of one turn."""
+
+        entry = await self._get_or_create(session_id)
+        try:
+            async with entry.lock:
+                if entry.turns >= self.max_turns:
+                    await self._rotate(entry)
+                try:
+                    yield entry
+                finally:
+                    entry.turns += 1
+                    entry.last_used = time.monotonic()
+        finally:
+            entry.users -= 1
+
+    async def _get_or_create(self, session_id: str) -> SessionThread:
+        # Returns the entry with a reference taken for the caller, which must drop it after the turn.
+        # The bookkeeping never awaits, so only the creation of this session's own thread is waited on
+        while True:
+            self._evict_expired()
+
+            entry = self._sessions.get(session_id)
+            if entry:
+                self._sessions.move_to_end(session_id)
+                entry.last_used = time.monotonic()
+                entry.users += 1
+                return entry
+
+            creating = self._creating.get(session_id)
+            if creating is None:
+                creating = asyncio.get_running_loop().create_task(self._create(session_id))
+                self._creating[session_id] = creating
+                creating.add_done_callback(lambda _: self._creating.pop(session_id, None))
+
+            # A caller that gives up does not cancel the creation for the others. The new entry is
+            # looked up again, since it could have been evicted before this caller resumed
+            await asyncio.shield(creating)
+
+    async def _create(self, session_id: str) -> SessionThread:
+        thread = await self.agents_client.threads.create()
+        entry = SessionThread(session_id=session_id, thread_id=thread.id)
+        self._sessions[session_id] = entry
+        self._evict_over_capacity()
+        return entry
+
+    async def _rotate(self, entry: SessionThread) -> None:
+        # Start the session over on a new thread and delete the old one in the background
+        old_thread_id = entry.thread_id
+        thread = await self.agents_client.threads.create()
+        entry.thread_id = thread.id
+        entry.turns = 0
+        self._delete_thread_later(old_thread_id)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            entry for entry in self._sessions.values()
+            if now - entry.last_used > self.ttl_seconds and not entry.users
+        ]
+        for entry in expired:
+            self._evict(entry)
+
+    def _evict_over_capacity(self) -> None:
+        # Evict least recently used sessions first, skipping those in use or about to be
+        for entry in list(self._sessions.values()):
+            if len(self._sessions) <= self.max_threads:
+                break
+            if not entry.users:
+                self._evict(entry)
+
+    def _evict(self, entry: SessionThread) -> None:
+        del self._sessions[entry.session_id]
+        self._delete_thread_later(entry.thread_id)
+
+    def _delete_thread_later(self, thread_id: str) -> None:
+        task = asyncio.get_running_loop().create_task(self._delete_thread(thread_id))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+
+    async def _delete_thread(self, thread_id: str) -> None:
+        try:
+            await self.agents_client.threads.delete(thread_id)
+        except Exception as e:
+            print(f"WARNING: Failed to delete thread {thread_id}: {e}")
+
+    async def close(self) -> None:
+        """Delete all session threads and wait for pending deletions."""
+
+        if self._creating:
+            await asyncio.gather(*self._creating.values(), return_exceptions=True)
+        for entry in list(self._sessions.values()):
+            self._evict(entry)
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
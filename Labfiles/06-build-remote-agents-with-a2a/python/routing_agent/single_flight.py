@@ -0,0 +1,53 @@
+""" Coalesces concurrent identical calls into one """
+
+import asyncio
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its result.
+
+    The first caller for a key starts the call in its own task; callers that
+    arrive while it is in flight wait for the same result (or exception).
+    A caller that gives up does not cancel the call for the others; the call
+    is only cancelled once every waiter has gone.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.get_running_loop().create_task(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._calls.pop(key, None) if self._calls.get(key) is call else None)
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {"in_flight": len(self._calls), "calls": self.calls, "shared": self.shared}
@@ -0,0 +1,101 @@
+""" Shapes what a delegation returns to the router model as its tool output """
+
+import json
+import os
+
+from typing import Any
+
+from a2a.types import Artifact, Part, Task, TaskState, TextPart
+from a2a.utils import get_message_text, get_text_parts
+
+TOOL_OUTPUT_MODES = ("text", "full")
+
+
+def task_text(task: Task) -> str:
+    """The agent's answer: its artifacts if it produced any, else its final status message."""
+
+    # Streamed artifacts arrive as many parts of one text, so parts are joined as-is
+    if task.artifacts:
+        return "\n".join("".join(get_text_parts(artifact.parts)) for artifact in task.artifacts)
+    if task.status.message:
+        return get_message_text(task.status.message)
+    return ""
+
+
+def _dumps(value: Any) -> str:
+    # No indentation or spaces after separators, and non-ASCII text kept as-is: fewer characters and tokens
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class ToolOutputProjection:
+    """Turns a remote agent's Task into the string the router model reads.
+
+    ``text`` mode keeps only the answer: the final artifact text (or the status
+    message when there is no artifact) and the task state when it did not
+    complete. History, per-part metadata and ids are left out. ``full`` mode
+    keeps the whole Task as JSON, as the lab originally did. Answer text
+    (in ``full`` mode, artifact text) longer than ``max_chars`` is cut,
+    keeping its beginning and end, so one verbose agent cannot crowd the
+    router's context.
+    """
+
+    def __init__(self, mode: str = "text", max_chars: int = 8000):
+        if mode not in TOOL_OUTPUT_MODES:
+            raise ValueError(f"Unknown tool output mode '{mode}'. Choose from: {', '.join(TOOL_OUTPUT_MODES)}")
+        self.mode = mode
+        self.max_chars = max_chars
+        self.truncated = 0
+
+    @classmethod
+    def from_env(cls) -> 'ToolOutputProjection':
+        return cls(
+            mode=os.getenv("ROUTING_TOOL_OUTPUT", "text"),
+            max_chars=int(os.getenv("ROUTING_TOOL_OUTPUT_MAX_CHARS", "8000")),
+        )
+
+    def cap(self, text: str) -> str:
+        """``text`` unchanged if it fits, else its head and tail around a note of what was cut."""
+
+        if self.max_chars <= 0 or len(text) <= self.max_chars:
+            return text
+        self.truncated += 1
+        omitted = len(text) - self.max_chars
+        head = self.max_chars * 3 // 4
+        tail = self.max_chars - head
+        return f"{text[:head]}\n[... {omitted} characters omitted ...]\n{text[len(text) - tail:]}"
+
+    def task(self, agent_name: str, task: Task | None) -> str:
+        if not isinstance(task, Task):
+            return _dumps({"agent": agent_name, "error": "No task returned"})
+
+        if self.mode == "full":
+            # Pydantic's own serializer skips building the intermediate dict
+            if self.max_chars > 0:
+                task = task.model_copy(update={"artifacts": [self._cap_artifact(artifact) for artifact in task.artifacts or []] or None})
+            return task.model_dump_json(exclude_none=True, by_alias=True)
+
+        output: dict[str, Any] = {"agent": agent_name}
+        if task.status.state != TaskState.completed:
+            output["state"] = task.status.state.value
+        output["text"] = self.cap(task_text(task))
+        return _dumps(output)
+
+    def pipeline(self, result: dict[str, Any]) -> str:
+        if self.mode == "full":
+            return _dumps({**result, "steps": [{**step, "output": self.cap(step["output"])} for step in result["steps"]]})
+
+        # The rendered tasks only repeat the request and earlier answers
+        return _dumps({
+            "pipeline": result["pipeline"],
+            "steps": [{"agent": step["agent"], "text": self.cap(step["output"])} for step in result["steps"]],
+        })
+
+    def _cap_artifact(self, artifact: Artifact) -> Artifact:
+        text = "".join(get_text_parts(artifact.parts))
+        capped = self.cap(text)
+        if capped is text:
+            return artifact
+        return artifact.model_copy(update={"parts": [Part(root=TextPart(text=capped))]})
+
+    def stats(self) -> dict[str, Any]:
+        return {"mode": self.mode, "max_chars": self.max_chars, "truncated": self.truncated}
@@ -0,0 +1,117 @@
+""" Shared HTTP connection pool for the routing agent's A2A traffic """
+
+import importlib.util
+import os
+import time
+
+import httpx
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Wraps an httpx transport and records connection reuse and pool wait times.
+
+    httpcore reports per-request trace events; a request that never opens a TCP
+    connection was served from a kept-alive one, and the time until the request
+    headers (or a new connection) start is time spent waiting on the pool.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, pool: "AgentTransportPool"):
+        self._inner = inner
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        state = {"new_connection": False, "acquired": None}
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            if event_name == "connection.connect_tcp.started":
+                state["new_connection"] = True
+            if state["acquired"] is None and (
+                event_name == "connection.connect_tcp.started" or event_name.endswith("send_request_headers.started")
+            ):
+                state["acquired"] = time.perf_counter()
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            return await self._inner.handle_async_request(request)
+        finally:
+            acquired = state["acquired"] or time.perf_counter()
+            self._pool._record(state["new_connection"], acquired - started)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class AgentTransportPool:
+    """One keep-alive connection pool shared by every remote agent connection.
+
+    HTTP/2 is used when requested and the optional ``h2`` package is installed
+    (``pip install httpx[http2]``); otherwise the pool falls back to HTTP/1.1.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, timeout: float = 30.0, http2: bool = False):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            print("WARNING: HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+
+        self._client: httpx.AsyncClient | None = None
+        self._requests = 0
+        self._new_connections = 0
+        self._pool_wait_total = 0.0
+        self._pool_wait_max = 0.0
+
+    @classmethod
+    def from_env(cls) -> "AgentTransportPool":
+        """Build a pool from the A2A_HTTP_* environment variables."""
+        return cls(
+            max_connections=int(os.getenv("A2A_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("A2A_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("A2A_HTTP_KEEPALIVE_EXPIRY", "30")),
+            timeout=float(os.getenv("A2A_HTTP_TIMEOUT", "30")),
+            http2=os.getenv("A2A_HTTP2", "false").lower() == "true",
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            self._client = httpx.AsyncClient(
+                transport=_InstrumentedTransport(transport, self),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _record(self, new_connection: bool, pool_wait: float) -> None:
+        self._requests += 1
+        self._new_connections += int(new_connection)
+        self._pool_wait_total += pool_wait
+        self._pool_wait_max = max(self._pool_wait_max, pool_wait)
+
+    def stats(self) -> dict:
+        """Connection reuse and pool wait statistics since the pool was created."""
+        reused = self._requests - self._new_connections
+        return {
+            "http2": self.http2,
+            "requests": self._requests,
+            "new_connections": self._new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self._requests, 3) if self._requests else 0.0,
+            "pool_wait_avg_ms": round(self._pool_wait_total / self._requests * 1000, 3) if self._requests else 0.0,
+            "pool_wait_max_ms": round(self._pool_wait_max * 1000, 3),
+        }
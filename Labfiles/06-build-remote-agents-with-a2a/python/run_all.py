@@ -13,42 +13,71 @@ from dotenv import load_dotenv
 load_dotenv()
 
 server_url = os.environ["SERVER_URL"]
+
+# Worker processes per specialist server; the routing server keeps one
+# process because its conversation sessions live in memory
+agent_workers = int(os.getenv("AGENT_WORKERS", "1"))
+
 servers = [
     {
         "name": "title_agent_server",
         "module": "title_agent.server:app",
-        "port": os.environ["TITLE_AGENT_PORT"]
+        "port": os.environ["TITLE_AGENT_PORT"],
+        "workers": agent_workers,
     },
     {
         "name": "outline_agent_server",
         "module": "outline_agent.server:app",
-        "port": os.environ["OUTLINE_AGENT_PORT"]
+        "port": os.environ["OUTLINE_AGENT_PORT"],
+        "workers": agent_workers,
     },
     {
         "name": "routing_agent_server",
         "module": "routing_agent.server:app",
-        "port": os.environ["ROUTING_AGENT_PORT"]
+        "port": os.environ["ROUTING_AGENT_PORT"],
+        # The routing agent discovers the specialists' cards when it starts
+        "depends_on": ["title_agent_server", "outline_agent_server"],
     },
 ]
 
+# In shared mode every specialist agent runs in one agent_host process
+if os.getenv("AGENT_HOST_MODE", "separate") == "shared":
+    servers = [
+        {
+            "name": "agent_host_server",
+            "cmd": [sys.executable, "-m", "agent_host.server"],
+            "port": os.environ["TITLE_AGENT_PORT"],
+            "ports": [os.environ["TITLE_AGENT_PORT"], os.environ["OUTLINE_AGENT_PORT"]],
+        },
+        {**servers[-1], "depends_on": ["agent_host_server"]},
+    ]
+
 server_procs = []
 
-async def wait_for_server_ready(server, timeout=30):
-    async with httpx.AsyncClient() as client:
-        start = time.time()
-        while True:
+async def wait_for_server_ready(server, process, client, timeout=30, initial_delay=0.05, max_delay=0.5):
+    # Probe every health endpoint, backing off from a fast first poll
+    start = time.monotonic()
+    delay = initial_delay
+    pending = list(server.get("ports", [server["port"]]))
+    while True:
+        for port in list(pending):
             try:
-                health_url = f"http://{server_url}:{server['port']}/health"
+                health_url = f"http://{server_url}:{port}/health"
                 r = await client.get(health_url, timeout=2)
                 if r.status_code == 200:
-                    print(f"✅ {server['name']} is healthy and ready!")
-                    return True
+                    pending.remove(port)
             except Exception:
                 pass
-            if time.time() - start > timeout:
-                print(f"❌ Timeout waiting for server health at {health_url}")
-                return False
-            await asyncio.sleep(1)
+        if not pending:
+            return True
+        if process.poll() is not None:
+            print(f"❌ {server['name']} exited with code {process.returncode}")
+            return False
+        if time.monotonic() - start > timeout:
+            print(f"❌ Timeout waiting for server health at {health_url}")
+            return False
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
 
 def stream_subprocess_output(process):
     while True:
@@ -62,41 +91,89 @@ async def run_client_main():
     from client import main as client_main
     await client_main()
 
-async def main():
-    print("🚀 Starting server subprocesses...")
-    for server in servers:
+def launch_server(server):
+    cmd = server.get("cmd")
+    if cmd is None and server.get("workers", 1) > 1:
         cmd = [
             sys.executable,
             "-m",
-            "uvicorn",
+            "agent_host.workers",
             server["module"],
             "--host",
             server_url,
             "--port",
             str(server["port"]),
-            "--log-level",
-            "info"
+            "--workers",
+            str(server["workers"]),
         ]
-        
-        print(f"🚀 Starting {server['name']} on port {server['port']}")
-        process = subprocess.Popen(
-            cmd,
-            env=os.environ.copy(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            universal_newlines=True,
-        )
-        server_procs.append(process)
-
-        thread = threading.Thread(target=stream_subprocess_output, args=(process,), daemon=True)
-        thread.start()
-
-        ready = await wait_for_server_ready(server)
-        if not ready:
-            print(f"❌ Server '{server['name']}' failed to start, killing process...")
+    cmd = cmd or [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        server["module"],
+        "--host",
+        server_url,
+        "--port",
+        str(server["port"]),
+        "--log-level",
+        "info"
+    ]
+
+    print(f"🚀 Starting {server['name']} on port {server['port']}")
+    process = subprocess.Popen(
+        cmd,
+        env=os.environ.copy(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        universal_newlines=True,
+    )
+    server_procs.append(process)
+
+    thread = threading.Thread(target=stream_subprocess_output, args=(process,), daemon=True)
+    thread.start()
+    return process
+
+async def start_servers(launch_start):
+    # Start each server as soon as the servers it depends on are healthy
+    ready = {server["name"]: asyncio.get_running_loop().create_future() for server in servers}
+    timings = {}
+
+    async def start(server, client):
+        for dependency in server.get("depends_on", []):
+            if not await ready[dependency]:
+                ready[server["name"]].set_result(False)
+                return
+        launched = time.monotonic()
+        process = launch_server(server)
+        healthy = await wait_for_server_ready(server, process, client)
+        if healthy:
+            timings[server["name"]] = (launched - launch_start, time.monotonic() - launched)
+            print(f"✅ {server['name']} is healthy and ready!")
+        ready[server["name"]].set_result(healthy)
+
+    async with httpx.AsyncClient() as client:
+        await asyncio.gather(*(start(server, client) for server in servers))
+
+    failed = [name for name, future in ready.items() if not future.result()]
+    return failed, timings
+
+def print_timings(timings, total):
+    print("⏱️  Startup timings:")
+    for name, (started_at, boot_time) in timings.items():
+        print(f"   {name:<24} started at +{started_at:.2f}s, healthy after {boot_time:.2f}s")
+    print(f"   {'total':<24} {total:.2f}s")
+
+async def main():
+    print("🚀 Starting server subprocesses...")
+    launch_start = time.monotonic()
+    failed, timings = await start_servers(launch_start)
+    if failed:
+        print(f"❌ Server(s) {', '.join(failed)} failed to start, killing processes...")
+        for process in server_procs:
             process.kill()
-            sys.exit(1)
+        sys.exit(1)
+    print_timings(timings, time.monotonic() - launch_start)
 
     try:
         await run_client_main()
@@ -0,0 +1,241 @@
+""" Lightweight spans across the routing agent, A2A hops and Foundry calls
+
+Spans nest through a ContextVar, so concurrent requests (and the tasks they
+spawn) keep separate traces. Finished spans go to the configured exporter:
+
+- TRACING_EXPORTER=console prints one line per span;
+- TRACING_EXPORTER=json appends one JSON object per span to TRACING_FILE;
+- anything else (the default) turns tracing off at the cost of a ContextVar lookup.
+
+Any object with an ``export(span)`` method can be installed with ``set_exporter``.
+Trace context crosses A2A hops as a W3C ``traceparent`` entry in the message metadata.
+"""
+
+import atexit
+import functools
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+
+@dataclass
+class SpanContext:
+    """The identifiers a child span, local or remote, needs from its parent."""
+
+    trace_id: str
+    span_id: str
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float = field(default_factory=time.time)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    duration_ms: float | None = None
+    status: str = "ok"
+    error: str | None = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class ConsoleExporter:
+    """Prints one line per finished span."""
+
+    def export(self, span: Span) -> None:
+        attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+        status = f" ERROR {span.error}" if span.status == "error" else ""
+        print(f"[trace {span.trace_id[:8]}] {span.name} {span.duration_ms:.1f}ms {attributes}{status}")
+
+
+class JsonExporter:
+    """Appends one JSON object per finished span to ``path``.
+
+    A background thread serializes and writes the spans through one open
+    file, so exporting never blocks the event loop on file I/O.
+    """
+
+    def __init__(self, path: str = "traces.jsonl"):
+        self.path = path
+        self._spans: queue.SimpleQueue[Span | None] = queue.SimpleQueue()
+        self._file = open(path, "a")
+        self._writer = threading.Thread(target=self._write, name="trace-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def export(self, span: Span) -> None:
+        self._spans.put(span)
+
+    def _write(self) -> None:
+        while (span := self._spans.get()) is not None:
+            try:
+                self._file.write(json.dumps(span.to_dict(), default=str) + "\n")
+            except Exception as e:
+                print(f"WARNING: Failed to export span {span.name}: {e}")
+            # Flush once caught up so the file can be read while the process runs
+            if self._spans.empty():
+                self._file.flush()
+        self._file.close()
+
+    def close(self) -> None:
+        """Write the spans still queued and close the file."""
+
+        if self._writer.is_alive():
+            self._spans.put(None)
+            self._writer.join()
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter; does nothing without one."""
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(self, name: str, parent: SpanContext | None = None, **attributes) -> Span | None:
+        """Start a span under ``parent`` (default: the current span) without making it current."""
+
+        if self.exporter is None:
+            return None
+        parent = parent or (_current_span.get().context if _current_span.get() else None)
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span | None, error: BaseException | None = None) -> None:
+        if span is None:
+            return
+        span.duration_ms = round((time.perf_counter() - span._started) * 1000, 3)
+        if error is not None:
+            span.status = "error"
+            span.error = f"{type(error).__name__}: {error}"
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            print(f"WARNING: Failed to export span {span.name}: {e}")
+
+    @contextmanager
+    def span(self, name: str, parent: SpanContext | None = None, **attributes):
+        """Time the block as a span that is current inside it."""
+
+        span = self.start_span(name, parent=parent, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current_span.reset(token)
+
+
+def exporter_from_env() -> SpanExporter | None:
+    exporter = os.getenv("TRACING_EXPORTER", "").lower()
+    if exporter == "console":
+        return ConsoleExporter()
+    if exporter == "json":
+        return JsonExporter(os.getenv("TRACING_FILE", "traces.jsonl"))
+    return None
+
+
+tracer = Tracer(exporter_from_env())
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    tracer.exporter = exporter
+
+
+def span(name: str, parent: SpanContext | None = None, **attributes):
+    return tracer.span(name, parent=parent, **attributes)
+
+
+def start_span(name: str, parent: SpanContext | None = None, **attributes) -> Span | None:
+    return tracer.start_span(name, parent=parent, **attributes)
+
+
+def end_span(span: Span | None, error: BaseException | None = None) -> None:
+    tracer.end_span(span, error=error)
+
+
+def traced(name: str):
+    """Decorator that runs an async function inside a span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**attributes) -> None:
+    """Add attributes to the current span, if any."""
+
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def inject(metadata: dict[str, Any] | None = None, span: Span | None = None) -> dict[str, Any]:
+    """Return ``metadata`` with a traceparent for ``span`` (default: the current span)."""
+
+    metadata = dict(metadata or {})
+    span = span or _current_span.get()
+    if span is not None:
+        metadata["traceparent"] = f"00-{span.trace_id}-{span.span_id}-01"
+    return metadata
+
+
+def extract(metadata: dict[str, Any] | None) -> SpanContext | None:
+    """Read the parent span context from a traceparent in ``metadata``, if valid."""
+
+    parts = str((metadata or {}).get("traceparent", "")).split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return SpanContext(trace_id=parts[1], span_id=parts[2])